@@ -1,5 +1,6 @@
 """LightGBM regression model."""
 
+import hashlib
 from typing import Any, Optional
 import pandas as pd
 import numpy as np
@@ -17,6 +18,7 @@ class LightGBMRegressor(BaseModel):
         max_depth: int = 5,
         early_stopping_rounds: int = 50,
         random_seed: int = 42,
+        n_jobs: int = -1,
     ):
         """Initialize LightGBM model.
         
@@ -26,13 +28,47 @@ class LightGBMRegressor(BaseModel):
             max_depth: Maximum tree depth
             early_stopping_rounds: Early stopping rounds
             random_seed: Random seed
+            n_jobs: Number of threads (-1 uses LightGBM's default)
         """
         self.n_estimators = n_estimators
         self.learning_rate = learning_rate
         self.max_depth = max_depth
         self.early_stopping_rounds = early_stopping_rounds
         self.random_seed = random_seed
-        self.model: Optional[lgb.LGBMRegressor] = None
+        self.n_jobs = n_jobs
+        self.model: Optional[lgb.Booster] = None
+        # Binned training data (raw frame freed), kept so refits on unchanged
+        # data skip re-binning; keyed by a fingerprint of the data contents
+        self._train_ds: Optional[lgb.Dataset] = None
+        self._train_key: Optional[str] = None
+    
+    def __getstate__(self) -> dict:
+        """Drop cached Datasets when pickling (they wrap native handles)."""
+        state = self.__dict__.copy()
+        state['_train_ds'] = None
+        state['_train_key'] = None
+        return state
+    
+    @staticmethod
+    def _data_fingerprint(X: pd.DataFrame, y: Any) -> str:
+        """Hash the training data, so in-place edits invalidate the cache."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(pd.util.hash_pandas_object(X).to_numpy().tobytes())
+        digest.update(pd.util.hash_array(np.asarray(y)).tobytes())
+        digest.update(repr([(str(c), str(d)) for c, d in X.dtypes.items()]).encode())
+        return digest.hexdigest()
+    
+    def _params(self) -> dict:
+        """Native LightGBM parameters for this configuration."""
+        return {
+            'objective': 'regression',
+            'learning_rate': self.learning_rate,
+            'max_depth': self.max_depth,
+            'max_bin': 255,
+            'seed': self.random_seed,
+            'num_threads': max(self.n_jobs, 0),
+            'verbose': -1,
+        }
     
     def fit(
         self,
@@ -43,32 +79,48 @@ class LightGBMRegressor(BaseModel):
     ) -> 'LightGBMRegressor':
         """Train the model.
         
+        Uses the native ``lgb.train`` API. The binned training Dataset is
+        cached, so refitting on unchanged X/y data (e.g. after changing
+        hyperparameters) reuses the histograms instead of rebuilding them.
+        The cache holds only the binned data, not the training frame.
+        
         Args:
             X: Training features
             y: Training target
             val_X: Validation features (optional, for early stopping)
             val_y: Validation target (optional)
         """
-        self.model = lgb.LGBMRegressor(
-            n_estimators=self.n_estimators,
-            learning_rate=self.learning_rate,
-            max_depth=self.max_depth,
-            random_state=self.random_seed,
-            verbose=-1,
-        )
+        train_key = self._data_fingerprint(X, y)
+        if self._train_ds is None or self._train_key != train_key:
+            cat_cols = [c for c in X.columns if isinstance(X[c].dtype, pd.CategoricalDtype)]
+            # Construct now so the raw frame is released straight away
+            self._train_ds = lgb.Dataset(
+                X,
+                y,
+                categorical_feature=cat_cols or 'auto',
+                free_raw_data=True,
+                params={'max_bin': 255},
+            ).construct()
+            self._train_key = train_key
         
         # Fit with validation set if provided
         if val_X is not None and val_y is not None:
-            self.model.fit(
-                X,
-                y,
-                eval_set=[(val_X, val_y)],
+            val_ds = lgb.Dataset(val_X, val_y, reference=self._train_ds, free_raw_data=False)
+            self.model = lgb.train(
+                self._params(),
+                self._train_ds,
+                num_boost_round=self.n_estimators,
+                valid_sets=[val_ds],
                 callbacks=[
                     lgb.early_stopping(self.early_stopping_rounds, verbose=False),
                 ],
             )
         else:
-            self.model.fit(X, y)
+            self.model = lgb.train(
+                self._params(),
+                self._train_ds,
+                num_boost_round=self.n_estimators,
+            )
         
         return self
     
@@ -86,6 +138,24 @@ class LightGBMRegressor(BaseModel):
         
         return self.model.predict(X)
     
+    def predict_contrib(self, X: pd.DataFrame) -> np.ndarray:
+        """Compute exact TreeSHAP feature contributions with LightGBM itself.
+        
+        LightGBM evaluates TreeSHAP in its multithreaded C++ predictor, so no
+        Python-side tree traversal (or the ``shap`` package) is needed.
+        
+        Args:
+            X: Feature matrix
+            
+        Returns:
+            Array of shape (n_samples, n_features + 1); the last column is the
+            expected value (bias) and each row sums to the prediction
+        """
+        if self.model is None:
+            raise ValueError("Model must be fitted before prediction")
+        
+        return self.model.predict(X, pred_contrib=True)
+    
     def get_feature_importance(self) -> dict:
         """Get feature importance.
         
@@ -95,8 +165,8 @@ class LightGBMRegressor(BaseModel):
         if self.model is None:
             return {}
         
-        importances = self.model.feature_importances_
-        feature_names = self.model.feature_name_
+        importances = self.model.feature_importance()
+        feature_names = self.model.feature_name()
         
         return dict(zip(feature_names, importances))
 
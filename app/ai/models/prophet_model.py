@@ -4,6 +4,7 @@ from typing import Any, Optional, Dict
 import pandas as pd
 import numpy as np
 from prophet import Prophet
+from prophet.diagnostics import cross_validation, performance_metrics
 from .base import BaseModel
 
 
@@ -78,15 +79,21 @@ class ProphetForecaster(BaseModel):
             X: Feature matrix (must include date column)
             
         Returns:
-            Predictions array
+            Predictions array (Prophet ``yhat`` for each date in X)
+            
+        Raises:
+            ValueError: If the model is unfitted or X lacks the date column
         """
         if self.model is None:
             raise ValueError("Model must be fitted before prediction")
         
-        # Prophet requires future dates
-        # For now, return a placeholder
-        # This should be handled by forecast() method
-        return np.array([0.0] * len(X))
+        if not isinstance(X, pd.DataFrame) or self.date_col not in X.columns:
+            raise ValueError(
+                f"Prophet prediction requires a DataFrame with the '{self.date_col}' column"
+            )
+        
+        future = pd.DataFrame({'ds': pd.to_datetime(X[self.date_col]).to_numpy()})
+        return self.model.predict(future)['yhat'].to_numpy()
     
     def forecast(
         self,
@@ -129,55 +136,49 @@ class ProphetForecaster(BaseModel):
         target: str,
         date_col: str,
         horizon: int = 30,
+        n_splits: int = 1,
     ) -> Dict[str, float]:
         """Validate model on historical data.
         
+        Uses Prophet's ``cross_validation`` on the fitted model, so every fold
+        inherits its exact configuration (including the fallback settings
+        chosen in ``fit``). With ``n_splits > 1`` the folds are rolling
+        origins one horizon apart and are fitted in parallel processes.
+        
         Args:
             df: Full dataset
             target: Target column
             date_col: Date column
-            horizon: Forecast horizon for validation
+            horizon: Forecast horizon for validation (in rows)
+            n_splits: Number of rolling-origin folds
             
         Returns:
-            Dictionary with metrics
+            Dictionary with metrics (pooled over folds)
         """
         if self.model is None:
             return {'rmse': float('inf'), 'mae': float('inf')}
         
         # Use last horizon periods for validation
-        prophet_df = df[[date_col, target]].copy()
-        prophet_df.columns = ['ds', 'y']
-        prophet_df = prophet_df.sort_values('ds').dropna()
-        
-        if len(prophet_df) < horizon:
-            horizon = len(prophet_df) // 2
-        
-        train_df = prophet_df.iloc[:-horizon]
-        test_df = prophet_df.iloc[-horizon:]
-        
-        # Fit on training data
-        val_model = Prophet(
-            yearly_seasonality=self.yearly_seasonality,
-            weekly_seasonality=self.weekly_seasonality,
-            daily_seasonality=self.daily_seasonality,
+        ds = pd.to_datetime(df[[date_col, target]].dropna()[date_col]).sort_values()
+        
+        if len(ds) < horizon:
+            horizon = len(ds) // 2
+        
+        # Each fold needs at least one horizon of training history
+        n_splits = max(1, min(n_splits, len(ds) // max(horizon, 1) - 1))
+        cutoffs = [ds.iloc[-(k * horizon) - 1] for k in range(n_splits, 0, -1)]
+        horizon_td = ds.iloc[-1] - cutoffs[-1]
+        
+        df_cv = cross_validation(
+            self.model,
+            horizon=horizon_td,
+            cutoffs=cutoffs,
+            parallel='processes' if n_splits > 1 else None,
+            disable_tqdm=True,
         )
-        val_model.fit(train_df)
-        
-        # Predict
-        future = val_model.make_future_dataframe(periods=horizon)
-        forecast = val_model.predict(future)
-        
-        # Calculate metrics
-        actual = test_df['y'].values
-        predicted = forecast['yhat'].tail(horizon).values
-        
-        mae = np.mean(np.abs(actual - predicted))
-        rmse = np.sqrt(np.mean((actual - predicted) ** 2))
+        metrics = performance_metrics(df_cv, metrics=['mae', 'rmse'], rolling_window=1)
         
         return {
-            'mae': float(mae),
-            'rmse': float(rmse),
+            'mae': float(metrics['mae'].mean()),
+            'rmse': float(metrics['rmse'].mean()),
         }
-
-
-
@@ -3,9 +3,16 @@
 from typing import Any, Optional
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor as SKRandomForestRegressor
 from .base import BaseModel
 
+# Prefer the oneDAL-backed drop-in from Intel Extension for Scikit-learn
+try:
+    from sklearnex.ensemble import RandomForestRegressor as SKRandomForestRegressor
+    SKLEARNEX_AVAILABLE = True
+except ImportError:
+    from sklearn.ensemble import RandomForestRegressor as SKRandomForestRegressor
+    SKLEARNEX_AVAILABLE = False
+
 
 class RandomForestRegressor(BaseModel):
     """Random Forest regression wrapper."""
@@ -16,6 +23,7 @@ class RandomForestRegressor(BaseModel):
         max_depth: Optional[int] = None,
         min_samples_split: int = 2,
         random_seed: int = 42,
+        n_jobs: int = -1,
     ):
         """Initialize Random Forest model.
         
@@ -24,11 +32,13 @@ class RandomForestRegressor(BaseModel):
             max_depth: Maximum tree depth
             min_samples_split: Minimum samples to split
             random_seed: Random seed
+            n_jobs: Number of parallel jobs (-1 uses all cores)
         """
         self.n_estimators = n_estimators
         self.max_depth = max_depth
         self.min_samples_split = min_samples_split
         self.random_seed = random_seed
+        self.n_jobs = n_jobs
         self.model: Optional[SKRandomForestRegressor] = None
     
     def fit(
@@ -48,7 +58,7 @@ class RandomForestRegressor(BaseModel):
             max_depth=self.max_depth,
             min_samples_split=self.min_samples_split,
             random_state=self.random_seed,
-            n_jobs=-1,
+            n_jobs=self.n_jobs,
         )
         self.model.fit(X, y)
         return self
@@ -0,0 +1,109 @@
+"""Numba kernels for feature engineering hot loops."""
+
+from pathlib import Path
+import numpy as np
+
+# Optional import: Numba is only used for large frames
+try:
+    from numba import config as numba_config, njit, prange
+    NUMBA_AVAILABLE = True
+    # Persist the compiled kernels below in a project-local cache. Set through
+    # numba's config (read when each cached kernel is defined), so it works
+    # even if numba was imported first and leaves the process environment
+    # alone; an explicit NUMBA_CACHE_DIR still wins.
+    if not numba_config.CACHE_DIR:
+        numba_config.CACHE_DIR = str(Path(__file__).resolve().parents[3] / '.numba_cache')
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in so the kernels stay importable without Numba."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Below this many rows the JIT cold start outweighs the pandas overhead
+NUMBA_MIN_ROWS = 10_000
+
+
+# Explicit signatures compile (or load from the cache) at import time, so the
+# first dashboard request does not pay the JIT pause
+@njit('void(float64[:], int32[:], int64, float64[:], float64[:])', cache=True, parallel=True)
+def group_rolling_mean_std(y, group_ids, window, out_mean, out_std):
+    """Rolling mean and sample std per contiguous group (min_periods=1).
+    
+    Rows must be ordered so each group occupies one contiguous block. Uses
+    Welford's add/remove update, so each window is a single O(N) pass.
+    
+    Args:
+        y: Float64 values
+        group_ids: Integer group code per row
+        window: Rolling window size
+        out_mean: Output array for the rolling mean
+        out_std: Output array for the rolling std (NaN with fewer than 2 values)
+    """
+    n = y.shape[0]
+    if n == 0:
+        return
+    
+    # Start offset of every contiguous group, plus a terminating n
+    n_groups = 1
+    for i in range(1, n):
+        if group_ids[i] != group_ids[i - 1]:
+            n_groups += 1
+    starts = np.empty(n_groups + 1, dtype=np.int64)
+    starts[0] = 0
+    k = 1
+    for i in range(1, n):
+        if group_ids[i] != group_ids[i - 1]:
+            starts[k] = i
+            k += 1
+    starts[n_groups] = n
+    
+    for g in prange(n_groups):
+        lo = starts[g]
+        hi = starts[g + 1]
+        nobs = 0
+        mean = 0.0
+        ssqdm = 0.0
+        for i in range(lo, hi):
+            # Add the incoming value
+            x = y[i]
+            nobs += 1
+            delta = x - mean
+            mean += delta / nobs
+            ssqdm += delta * (x - mean)
+            
+            # Drop the value leaving the window
+            if i - lo >= window:
+                x_old = y[i - window]
+                nobs -= 1
+                delta = x_old - mean
+                mean -= delta / nobs
+                ssqdm -= delta * (x_old - mean)
+            
+            out_mean[i] = mean
+            if nobs > 1:
+                out_std[i] = np.sqrt(max(ssqdm, 0.0) / (nobs - 1))
+            else:
+                out_std[i] = np.nan
+
+
+def warm_up_kernels() -> None:
+    """Run every kernel once on a tiny input.
+    
+    Loads the compiled code and starts Numba's thread pool ahead of the first
+    real request. A no-op when Numba is not installed.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    from ..utils.metrics import _nan_mean_std, _abs_scaled_deviation
+    
+    y = np.arange(16, dtype=np.float64)
+    out_mean = np.empty_like(y)
+    out_std = np.empty_like(y)
+    group_rolling_mean_std(y, np.zeros(16, dtype=np.int32), 3, out_mean, out_std)
+    mean, std = _nan_mean_std(y)
+    _abs_scaled_deviation(y, mean, std)
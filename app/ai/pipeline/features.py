@@ -4,6 +4,7 @@ from typing import Optional, Tuple, List
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
+from ._kernels import NUMBA_AVAILABLE, NUMBA_MIN_ROWS, group_rolling_mean_std
 
 
 @dataclass
@@ -39,6 +40,7 @@ class FeatureFactory:
         site_col: Optional[str] = None,
         test_size: float = 0.2,
         val_size: float = 0.1,
+        model_hint: Optional[str] = None,
     ) -> FeatureSet:
         """Build feature set from dataset.
         
@@ -49,40 +51,64 @@ class FeatureFactory:
             site_col: Site/station column name
             test_size: Test set proportion
             val_size: Validation set proportion
+            model_hint: 'lgb' keeps NaN and encodes string features as pandas
+                categoricals for LightGBM; otherwise NaN features are filled with 0
             
         Returns:
             FeatureSet with train/val/test splits
         """
-        df_features = df.copy()
+        if not (site_col and site_col in df.columns):
+            return self.build_single_site(
+                df,
+                target_col,
+                date_col,
+                test_size=test_size,
+                val_size=val_size,
+                model_hint=model_hint,
+            )
+        
+        # From here on the frame always has a site column
+        
+        # Single defensive copy; the _add_* helpers below mutate it in place
+        df_features = df.copy(deep=True)
         
         # Drop missing target values
-        df_features = df_features.dropna(subset=[target_col])
+        df_features.dropna(subset=[target_col], inplace=True)
         
         # Create time-based features
         if date_col and date_col in df_features.columns:
             df_features = self._add_time_features(df_features, date_col)
         
+        # Order rows once (by site, then date) for the lag and rolling helpers
+        sort_cols = [site_col] + ([date_col] if date_col else [])
+        df_features.sort_values(sort_cols, inplace=True, kind='stable')
+        
         # Create lag features
-        df_features = self._add_lag_features(df_features, target_col, date_col)
+        df_features = self._add_lag_features(df_features, target_col, date_col, site_col)
         
         # Create rolling window features
         df_features = self._add_rolling_features(df_features, target_col, date_col, site_col)
         
-        # Create site-specific features if site column exists
-        if site_col and site_col in df_features.columns:
-            df_features = self._add_site_features(df_features, site_col)
+        # Create site-specific features
+        df_features = self._add_site_features(df_features, site_col)
         
         # Select feature columns (exclude target, date, site)
         exclude_cols = [target_col]
         if date_col:
             exclude_cols.append(date_col)
-        if site_col:
-            exclude_cols.append(site_col)
+        exclude_cols.append(site_col)
         
         feature_cols = [c for c in df_features.columns if c not in exclude_cols]
         
         # Handle missing values
-        df_features[feature_cols] = df_features[feature_cols].fillna(0)
+        if model_hint == 'lgb':
+            # LightGBM routes NaN natively and bundles sparse columns (EFB), so
+            # keep missing values and pass string columns as categoricals
+            cat_cols = df_features[feature_cols].select_dtypes(include=['object', 'string']).columns
+            if len(cat_cols) > 0:
+                df_features[cat_cols] = df_features[cat_cols].astype('category')
+        else:
+            df_features[feature_cols] = df_features[feature_cols].fillna(0)
         
         # Split data
         train_X, train_y, val_X, val_y, test_X, test_y = self._split_data(
@@ -104,18 +130,152 @@ class FeatureFactory:
             feature_names=feature_cols,
         )
     
+    def build_single_site(
+        self,
+        df: pd.DataFrame,
+        target_col: str,
+        date_col: Optional[str] = None,
+        test_size: float = 0.2,
+        val_size: float = 0.1,
+        model_hint: Optional[str] = None,
+    ) -> FeatureSet:
+        """Build feature set for a single time series (no site column).
+        
+        Produces the same features as ``build`` without any grouping: rows are
+        selected and ordered with one ``take``, the engineered features are
+        computed on NumPy arrays, and the frame is assembled once at the end.
+        
+        Args:
+            df: Input DataFrame
+            target_col: Target column name
+            date_col: Date column name (for time-based features)
+            test_size: Test set proportion
+            val_size: Validation set proportion
+            model_hint: See ``build``
+            
+        Returns:
+            FeatureSet with train/val/test splits
+        """
+        has_date = bool(date_col) and date_col in df.columns
+        
+        # Keep rows with a target, ordered by date
+        positions = np.flatnonzero(df[target_col].notna().to_numpy())
+        if has_date:
+            dates = df[date_col]
+            if not pd.api.types.is_datetime64_any_dtype(dates):
+                dates = pd.to_datetime(dates, errors='coerce')
+            dates = dates.to_numpy()[positions]
+            order = np.argsort(dates, kind='stable')
+            positions = positions[order]
+            dates = dates[order]
+        base = df.take(positions)
+        if has_date:
+            base[date_col] = dates
+        
+        y = np.require(base[target_col].to_numpy(dtype=np.float64), requirements='W')
+        n = len(y)
+        block = {}
+        
+        # Time-based features
+        if has_date:
+            idx = pd.DatetimeIndex(dates)
+            dow = idx.dayofweek.to_numpy()
+            block['hour'] = idx.hour.to_numpy()
+            block['day_of_week'] = dow
+            block['day_of_month'] = idx.day.to_numpy()
+            block['month'] = idx.month.to_numpy()
+            block['quarter'] = idx.quarter.to_numpy()
+            block['is_weekend'] = (dow >= 5).view(np.int8)
+        
+        # Lag features: row i of the window view over the NaN-padded target is
+        # y[i - L .. i], so reversing it gives lags 1..L
+        n_lags = len(range(1, min(self.max_lags + 1, n)))
+        if n_lags > 0:
+            padded = np.concatenate([np.full(n_lags, np.nan), y])
+            windows = np.lib.stride_tricks.sliding_window_view(padded, n_lags + 1)
+            lag_matrix = windows[:, -2::-1]
+            for j in range(n_lags):
+                block[f'{target_col}_lag_{j + 1}'] = lag_matrix[:, j]
+        
+        # Rolling window features
+        use_numba = NUMBA_AVAILABLE and n > NUMBA_MIN_ROWS
+        group_ids = np.zeros(n, dtype=np.int32)
+        y_series = pd.Series(y)
+        for window in self.window_sizes:
+            if use_numba:
+                out_mean = np.empty_like(y)
+                out_std = np.empty_like(y)
+                group_rolling_mean_std(y, group_ids, window, out_mean, out_std)
+            else:
+                roll = y_series.rolling(window, min_periods=1)
+                out_mean = roll.mean().to_numpy()
+                out_std = roll.std().to_numpy()
+            block[f'{target_col}_rolling_mean_{window}'] = out_mean
+            block[f'{target_col}_rolling_std_{window}'] = out_std
+        
+        df_features = pd.concat([base, pd.DataFrame(block, index=base.index)], axis=1)
+        
+        exclude_cols = [target_col]
+        if date_col:
+            exclude_cols.append(date_col)
+        feature_cols = [c for c in df_features.columns if c not in exclude_cols]
+        
+        # Handle missing values
+        if model_hint == 'lgb':
+            cat_cols = df_features[feature_cols].select_dtypes(include=['object', 'string']).columns
+            if len(cat_cols) > 0:
+                df_features[cat_cols] = df_features[cat_cols].astype('category')
+        else:
+            df_features[feature_cols] = df_features[feature_cols].fillna(0)
+        
+        train_X, train_y, val_X, val_y, test_X, test_y = self._split_data(
+            df_features,
+            target_col,
+            feature_cols,
+            date_col if has_date else None,
+            test_size,
+            val_size,
+        )
+        
+        return FeatureSet(
+            train_X=train_X,
+            train_y=train_y,
+            val_X=val_X,
+            val_y=val_y,
+            test_X=test_X,
+            test_y=test_y,
+            feature_names=feature_cols,
+        )
+    
+    @staticmethod
+    def densify(X: pd.DataFrame) -> pd.DataFrame:
+        """Fill NaN with 0 and integer-encode categoricals.
+        
+        For models without native missing-value or categorical support
+        (e.g. Random Forest) fed from a ``model_hint='lgb'`` feature set.
+        """
+        cat_cols = X.select_dtypes(include=['category']).columns
+        if len(cat_cols) == 0:
+            return X.fillna(0)
+        X = X.copy()
+        X[cat_cols] = X[cat_cols].apply(lambda s: s.cat.codes)
+        return X.fillna(0)
+    
     def _add_time_features(self, df: pd.DataFrame, date_col: str) -> pd.DataFrame:
-        """Add time-based features."""
-        df = df.copy()
+        """Add time-based features (mutates ``df`` in place)."""
         if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
             df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
         
-        df['hour'] = df[date_col].dt.hour
-        df['day_of_week'] = df[date_col].dt.dayofweek
-        df['day_of_month'] = df[date_col].dt.day
-        df['month'] = df[date_col].dt.month
-        df['quarter'] = df[date_col].dt.quarter
-        df['is_weekend'] = (df[date_col].dt.dayofweek >= 5).astype(int)
+        # One DatetimeIndex view serves every field; dayofweek is reused for is_weekend
+        idx = pd.DatetimeIndex(df[date_col])
+        dow = idx.dayofweek.to_numpy()
+        
+        df['hour'] = idx.hour.to_numpy()
+        df['day_of_week'] = dow
+        df['day_of_month'] = idx.day.to_numpy()
+        df['month'] = idx.month.to_numpy()
+        df['quarter'] = idx.quarter.to_numpy()
+        df['is_weekend'] = (dow >= 5).view(np.int8)
         
         return df
     
@@ -123,16 +283,36 @@ class FeatureFactory:
         self,
         df: pd.DataFrame,
         target_col: str,
-        date_col: Optional[str] = None,
+        date_col: Optional[str],
+        site_col: str,
     ) -> pd.DataFrame:
-        """Add lagged target features."""
-        df = df.copy()
+        """Add lagged target features (mutates ``df`` in place).
         
-        if date_col:
-            df = df.sort_values(date_col)
+        Expects a site column and rows already ordered by site and date (see
+        ``build``; frames without a site go through ``build_single_site``).
+        Lags are built as one NumPy block and assigned in a single step, and
+        never reach across into another site.
+        """
+        lags = list(range(1, min(self.max_lags + 1, len(df))))
+        if not lags:
+            return df
+        
+        # Row i of the window view over the NaN-padded target is y[i - L .. i],
+        # so reversing it gives every lag 1..L without a copy per lag
+        n_lags = len(lags)
+        y = df[target_col].to_numpy(dtype=float)
+        padded = np.concatenate([np.full(n_lags, np.nan), y])
+        lag_matrix = np.lib.stride_tricks.sliding_window_view(padded, n_lags + 1)[:, -2::-1].copy()
+        
+        # A row's lag k comes from another site when fewer than k rows of its
+        # own site precede it (sites are contiguous after sorting)
+        site_codes = pd.factorize(df[site_col])[0]
+        positions = np.arange(len(y))
+        run_start = np.r_[True, site_codes[1:] != site_codes[:-1]]
+        position_in_site = positions - np.maximum.accumulate(np.where(run_start, positions, 0))
+        lag_matrix[position_in_site[:, None] < np.arange(1, n_lags + 1)] = np.nan
         
-        for lag in range(1, min(self.max_lags + 1, len(df))):
-            df[f'{target_col}_lag_{lag}'] = df[target_col].shift(lag)
+        df[[f'{target_col}_lag_{lag}' for lag in lags]] = lag_matrix
         
         return df
     
@@ -140,36 +320,38 @@ class FeatureFactory:
         self,
         df: pd.DataFrame,
         target_col: str,
-        date_col: Optional[str] = None,
-        site_col: Optional[str] = None,
+        date_col: Optional[str],
+        site_col: str,
     ) -> pd.DataFrame:
-        """Add rolling window statistics."""
-        df = df.copy()
-        
-        if date_col:
-            df = df.sort_values(date_col)
+        """Add rolling window statistics (mutates ``df`` in place).
         
-        group_cols = [date_col] if date_col else None
-        if site_col and site_col in df.columns:
-            group_cols = [site_col, date_col] if date_col else [site_col]
+        Expects a site column and rows already ordered by site and date (see
+        ``build``; frames without a site go through ``build_single_site``).
+        Large frames go through a Numba kernel when it is installed.
+        """
+        if NUMBA_AVAILABLE and len(df) > NUMBA_MIN_ROWS:
+            # The kernel signature takes writable arrays (copy-on-write views are read-only)
+            y = np.require(df[target_col].to_numpy(dtype=np.float64), requirements='W')
+            group_ids = pd.factorize(df[site_col])[0].astype(np.int32)
             for window in self.window_sizes:
-                df[f'{target_col}_rolling_mean_{window}'] = df.groupby(site_col)[target_col].transform(
-                    lambda x: x.rolling(window, min_periods=1).mean()
-                )
-                df[f'{target_col}_rolling_std_{window}'] = df.groupby(site_col)[target_col].transform(
-                    lambda x: x.rolling(window, min_periods=1).std()
-                )
+                out_mean = np.empty_like(y)
+                out_std = np.empty_like(y)
+                group_rolling_mean_std(y, group_ids, window, out_mean, out_std)
+                df[f'{target_col}_rolling_mean_{window}'] = out_mean
+                df[f'{target_col}_rolling_std_{window}'] = out_std
         else:
+            # Each site is a contiguous block, so the grouped rolling output
+            # lines up positionally with the frame.
+            grouped = df.groupby(site_col, sort=False, observed=True, dropna=False)[target_col]
             for window in self.window_sizes:
-                df[f'{target_col}_rolling_mean_{window}'] = df[target_col].rolling(window, min_periods=1).mean()
-                df[f'{target_col}_rolling_std_{window}'] = df[target_col].rolling(window, min_periods=1).std()
+                roll = grouped.rolling(window, min_periods=1).agg(['mean', 'std'])
+                df[f'{target_col}_rolling_mean_{window}'] = roll['mean'].to_numpy()
+                df[f'{target_col}_rolling_std_{window}'] = roll['std'].to_numpy()
         
         return df
     
     def _add_site_features(self, df: pd.DataFrame, site_col: str) -> pd.DataFrame:
         """Add site-specific aggregations."""
-        df = df.copy()
-        
         numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
         if site_col in numeric_cols:
             numeric_cols.remove(site_col)
@@ -189,17 +371,20 @@ class FeatureFactory:
         val_size: float,
     ) -> Tuple[pd.DataFrame, pd.Series, pd.DataFrame, pd.Series, pd.DataFrame, pd.Series]:
         """Split data into train/val/test sets."""
-        # Remove rows with NaN in features or target
-        mask = ~(df[feature_cols + [target_col]].isnull().any(axis=1))
-        df_clean = df[mask].copy()
+        # Keep rows with a target (feature NaNs were filled or kept on purpose)
+        idx = np.flatnonzero(df[target_col].notna().to_numpy())
+        
+        # Time-based split if date column exists: order the kept positions by
+        # date, then take a single positional selection
+        if date_col:
+            idx = idx[np.argsort(df[date_col].to_numpy()[idx], kind='stable')]
+        df_clean = df.iloc[idx]
         
         n = len(df_clean)
         test_end = int(n * (1 - test_size))
         val_end = int(n * (1 - test_size - val_size))
         
-        # Time-based split if date column exists
         if date_col:
-            df_clean = df_clean.sort_values(date_col)
             train_df = df_clean.iloc[:val_end]
             val_df = df_clean.iloc[val_end:test_end]
             test_df = df_clean.iloc[test_end:]
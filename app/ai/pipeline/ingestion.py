@@ -1,23 +1,97 @@
 """Data ingestion engine for wastewater datasets."""
 
+import re
 from pathlib import Path
 from typing import Optional, Dict, Any, List
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+# Optional import: PyArrow gives a multi-threaded CSV parser
+try:
+    import pyarrow.csv as pa_csv
+    import pyarrow.feather as pa_feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Cheap prefilter for ISO-like dates (YYYY-MM-DD or YYYY/MM/DD)
+_DATE_RE = re.compile(r'^\d{4}[-/]\d{1,2}[-/]\d{1,2}')
+
+# Column-name heuristics used by detect_schema
+_DATE_NAME_RE = re.compile(r'date|time')
+_SITE_NAME_RE = re.compile(r'site|station|location|plant')
+_TARGET_NAME_RE = re.compile(r'bod|cod|tss|nh4|no3|po4')
+
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=8)
+def _load_file(file_path: str, mtime: float, nrows: Optional[int] = None) -> pd.DataFrame:
+    """Parse a data file, memoized across Streamlit reruns.
+    
+    Args:
+        file_path: Path to data file
+        mtime: File modification time (only used as a cache key)
+        nrows: Only read the first ``nrows`` rows (all rows if None)
+        
+    Returns:
+        Loaded DataFrame
+    """
+    return _read_table(file_path, Path(file_path).suffix.lower(), nrows)
+
+
+def _read_table(source: Any, suffix: str, nrows: Optional[int] = None) -> pd.DataFrame:
+    """Parse a path or binary file-like object according to its suffix.
+    
+    Args:
+        source: File path or readable binary buffer
+        suffix: Lowercase file extension including the dot
+        nrows: Only read the first ``nrows`` rows (all rows if None)
+        
+    Returns:
+        Loaded DataFrame
+    """
+    if suffix == '.csv':
+        # PyArrow has no nrows; the C parser stops early instead
+        if PYARROW_AVAILABLE and nrows is None:
+            # Read with PyArrow directly so ISO date columns (inferred as
+            # Arrow dates) arrive as datetime64 rather than Python date
+            # objects. Other columns keep NumPy dtypes: an Arrow-backed frame
+            # would force conversions in the NumPy/Numba feature code.
+            # split_blocks + self_destruct release each Arrow column as it is
+            # converted, so the table and the frame are never both fully held
+            return pa_csv.read_csv(source).to_pandas(
+                date_as_object=False,
+                split_blocks=True,
+                self_destruct=True,
+            )
+        return pd.read_csv(source, nrows=nrows)
+    elif suffix in ['.xlsx', '.xls']:
+        return pd.read_excel(source, nrows=nrows)
+    elif suffix == '.parquet':
+        df = pd.read_parquet(source, engine='pyarrow' if PYARROW_AVAILABLE else 'auto')
+        return df if nrows is None else df.iloc[:nrows]
+    elif suffix == '.feather':
+        if PYARROW_AVAILABLE:
+            df = pa_feather.read_table(source).to_pandas(date_as_object=False, split_blocks=True, self_destruct=True)
+        else:
+            df = pd.read_feather(source)
+        return df if nrows is None else df.iloc[:nrows]
+    raise ValueError(f"Cannot load {suffix} files")
+
 
 class DataIngestionEngine:
     """Handles data loading, schema detection, and validation."""
     
     def __init__(self):
         """Initialize ingestion engine."""
-        self.supported_formats = ['.csv', '.xlsx', '.xls', '.parquet']
+        self.supported_formats = ['.csv', '.xlsx', '.xls', '.parquet', '.feather']
     
-    def load_from_path(self, file_path: str) -> pd.DataFrame:
+    def load_from_path(self, file_path: str, nrows: Optional[int] = None) -> pd.DataFrame:
         """Load dataset from file path.
         
         Args:
             file_path: Path to data file
+            nrows: Only read the first ``nrows`` rows (all rows if None)
             
         Returns:
             Loaded DataFrame
@@ -34,16 +108,30 @@ class DataIngestionEngine:
         if suffix not in self.supported_formats:
             raise ValueError(f"Unsupported file format: {suffix}")
         
-        if suffix == '.csv':
-            df = pd.read_csv(file_path)
-        elif suffix in ['.xlsx', '.xls']:
-            df = pd.read_excel(file_path)
-        elif suffix == '.parquet':
-            df = pd.read_parquet(file_path)
-        else:
-            raise ValueError(f"Cannot load {suffix} files")
+        # mtime is part of the cache key, so an edited file is re-parsed
+        return _load_file(str(path), path.stat().st_mtime, nrows)
+    
+    def load_from_buffer(self, buffer: Any, extension: str, nrows: Optional[int] = None) -> pd.DataFrame:
+        """Load dataset from an in-memory file (e.g. a Streamlit upload).
+        
+        Parses the buffer directly instead of writing it to disk first.
         
-        return df
+        Args:
+            buffer: Readable binary file-like object
+            extension: File extension, with or without the leading dot
+            nrows: Only read the first ``nrows`` rows (all rows if None)
+            
+        Returns:
+            Loaded DataFrame
+            
+        Raises:
+            ValueError: If file format is unsupported
+        """
+        suffix = '.' + extension.lower().lstrip('.')
+        if suffix not in self.supported_formats:
+            raise ValueError(f"Unsupported file format: {suffix}")
+        
+        return _read_table(buffer, suffix, nrows)
     
     def detect_schema(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Detect schema and domain mappings.
@@ -63,29 +151,37 @@ class DataIngestionEngine:
             'categorical_columns': [],
         }
         
+        # Lowercase names and compute dtype flags once, then match all heuristics
+        names = df.columns.tolist()
+        lower = df.columns.astype(str).str.lower()
+        dtypes = df.dtypes.tolist()
+        date_mask = lower.str.contains(_DATE_NAME_RE)
+        site_mask = lower.str.contains(_SITE_NAME_RE)
+        target_mask = lower.str.contains(_TARGET_NAME_RE)
+        numeric_mask = [pd.api.types.is_numeric_dtype(dtype) for dtype in dtypes]
+        
         # Detect date column
-        for col in df.columns:
-            if 'date' in col.lower() or 'time' in col.lower():
-                if pd.api.types.is_datetime64_any_dtype(df[col]) or \
-                   self._can_parse_date(df[col].head(100)):
-                    schema['date_column'] = col
-                    break
+        for i in np.flatnonzero(date_mask):
+            if pd.api.types.is_datetime64_any_dtype(dtypes[i]) or \
+               self._can_parse_date(df.iloc[:100, i]):
+                schema['date_column'] = names[i]
+                break
         
         # Detect site/station column
-        for col in df.columns:
-            if any(x in col.lower() for x in ['site', 'station', 'location', 'plant']):
-                if df[col].dtype in ['object', 'string']:
-                    schema['site_column'] = col
-                    break
+        for i in np.flatnonzero(site_mask):
+            if dtypes[i] in ['object', 'string']:
+                schema['site_column'] = names[i]
+                break
         
         # Separate numeric and categorical
-        for col in df.columns:
-            if col in [schema['date_column'], schema['site_column']]:
+        skip = {schema['date_column'], schema['site_column']} - {None}
+        for i, col in enumerate(names):
+            if col in skip:
                 continue
-            if pd.api.types.is_numeric_dtype(df[col]):
+            if numeric_mask[i]:
                 schema['numeric_columns'].append(col)
                 # Common targets in wastewater
-                if any(x in col.lower() for x in ['bod', 'cod', 'tss', 'nh4', 'no3', 'po4']):
+                if target_mask[i]:
                     schema['target_columns'].append(col)
                 else:
                     schema['feature_columns'].append(col)
@@ -96,38 +192,57 @@ class DataIngestionEngine:
     
     def _can_parse_date(self, series: pd.Series) -> bool:
         """Check if series can be parsed as dates."""
+        sample = series.dropna().head(10)
+        # Regex probe first so non-date columns never reach the parser
+        if not sample.astype(str).str.match(_DATE_RE).all():
+            return False
         try:
-            pd.to_datetime(series.dropna().head(10))
+            pd.to_datetime(sample, format='ISO8601', cache=True)
             return True
-        except:
+        except (ValueError, TypeError):
             return False
     
-    def validate_data(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def validate_data(
+        self,
+        df: pd.DataFrame,
+        key_cols: Optional[List[str]] = None,
+        schema: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
         """Validate data quality and return statistics.
         
         Args:
             df: DataFrame to validate
+            key_cols: Columns identifying a record (defaults to the schema's
+                date and site columns; all columns if neither is found)
+            schema: ``detect_schema`` output the caller already has; only
+                detected here when neither it nor ``key_cols`` is given
             
         Returns:
             Dictionary with validation stats
         """
+        if key_cols is None:
+            if schema is None:
+                schema = self.detect_schema(df)
+            key_cols = [c for c in (schema['date_column'], schema['site_column']) if c]
+        
         stats = {
             'rows': len(df),
             'columns': len(df.columns),
-            'missing_pct': (df.isnull().sum().sum() / (len(df) * len(df.columns)) * 100),
-            'duplicates': df.duplicated().sum(),
+            'missing_pct': (df.isna().to_numpy().sum() / (len(df) * len(df.columns)) * 100),
+            'duplicates': int(df.duplicated(subset=key_cols or None).sum()),
             'date_range': None,
         }
         
         # Try to find date range
-        for col in df.columns:
+        lower = df.columns.astype(str).str.lower()
+        for i, col in enumerate(df.columns):
             if pd.api.types.is_datetime64_any_dtype(df[col]):
                 stats['date_range'] = (
                     str(df[col].min()),
                     str(df[col].max())
                 )
                 break
-            elif 'date' in col.lower():
+            elif 'date' in lower[i]:
                 try:
                     dates = pd.to_datetime(df[col].dropna())
                     if len(dates) > 0:
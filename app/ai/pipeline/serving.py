@@ -1,10 +1,37 @@
 """Model serving layer for predictions."""
 
+import os
 from typing import Optional, Dict, Any, List
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import joblib
+import streamlit as st
+
+# Optional import: LZ4 compresses at GB/s; zlib is the stdlib fallback
+try:
+    import lz4  # noqa: F401
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+# Compression for saved models (joblib.load detects it, so older
+# uncompressed artifacts still load)
+MODEL_COMPRESSION = ('lz4', 3) if LZ4_AVAILABLE else ('zlib', 3)
+
+
+@st.cache_resource(show_spinner=False)
+def _cached_joblib_load(path_str: str, mtime: float) -> Any:
+    """Deserialize a model once and keep it in process memory across reruns.
+    
+    Args:
+        path_str: Path to the joblib artifact
+        mtime: File modification time (only used as a cache key)
+        
+    Returns:
+        Loaded model (shared between callers; do not mutate)
+    """
+    return joblib.load(path_str)
 
 
 class ServingLayer:
@@ -36,7 +63,8 @@ class ServingLayer:
             Path to saved model
         """
         model_path = self.registry_path / f"{name}.joblib"
-        joblib.dump(model, model_path)
+        joblib.dump(model, model_path, compress=MODEL_COMPRESSION, protocol=5)
+        self.clear_cache()
         
         # Save metadata if provided
         if metadata:
@@ -56,11 +84,31 @@ class ServingLayer:
         Returns:
             Loaded model or None if not found
         """
-        model_path = self.registry_path / f"{name}.joblib"
-        if not model_path.exists():
-            return None
+        return self.load_model_file(str(self.registry_path / f"{name}.joblib"))
+    
+    @staticmethod
+    def load_model_file(model_path: str) -> Optional[Any]:
+        """Load a saved model artifact by path, memoized across reruns.
         
-        return joblib.load(model_path)
+        Args:
+            model_path: Path returned by ``save_model``
+            
+        Returns:
+            Loaded model (shared between callers; do not mutate) or None if
+            the file does not exist
+        """
+        # One stat call both checks existence and yields the mtime, which is
+        # part of the cache key so an overwritten artifact is reloaded
+        try:
+            mtime = os.stat(model_path).st_mtime
+        except FileNotFoundError:
+            return None
+        return _cached_joblib_load(str(model_path), mtime)
+    
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop every memoized model loaded by ``load_model``."""
+        _cached_joblib_load.clear()
     
     def predict(
         self,
@@ -76,10 +124,29 @@ class ServingLayer:
             return_std: Whether to return standard deviation (for probabilistic models)
             
         Returns:
-            Predictions array
+            Predictions array (float32; ~7 significant digits is ample for
+            metrics and plotting, and halves the bytes moved downstream)
+        """
+        predictions = model.predict(self._as_model_input(model, X))
+        return np.asarray(predictions).astype(np.float32, copy=False)
+    
+    @staticmethod
+    def _as_model_input(model: Any, X: Any) -> Any:
+        """Hand all-numeric frames to the model as one contiguous array.
+        
+        The array takes the columns' common dtype: float64 for the
+        ``FeatureFactory`` feature frames (float lags and rolling stats mixed
+        with integer calendar features). Frames with non-numeric columns (dates for Prophet, categoricals for LightGBM) and
+        scikit-learn estimators fitted with feature names keep the DataFrame.
         """
-        predictions = model.predict(X)
-        return predictions
+        if not isinstance(X, pd.DataFrame) or X.empty:
+            return X
+        estimator = getattr(model, 'model', model)
+        if getattr(estimator, 'feature_names_in_', None) is not None:
+            return X
+        if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in X.dtypes):
+            return X
+        return np.ascontiguousarray(X.to_numpy())
     
     def forecast(
         self,
@@ -97,20 +164,28 @@ class ServingLayer:
             **kwargs: Additional model-specific parameters
             
         Returns:
-            Dictionary with 'forecast', 'lower', 'upper' arrays
+            Dictionary with 'forecast', 'lower', 'upper' float32 arrays
         """
         # Try model.forecast() if available, otherwise use predict
         if hasattr(model, 'forecast'):
             result = model.forecast(X, horizon=horizon, **kwargs)
+            for key in ('forecast', 'lower', 'upper'):
+                if key in result:
+                    result[key] = np.asarray(result[key]).astype(np.float32, copy=False)
             return result
         
         # Fallback: just use predict
         predictions = self.predict(model, X)
         
-        # Simple confidence intervals (can be improved with model-specific logic)
-        std = np.std(predictions) if len(predictions) > 1 else predictions[0] * 0.1
-        lower = predictions - 1.96 * std
-        upper = predictions + 1.96 * std
+        # Simple confidence intervals (can be improved with model-specific logic):
+        # one scalar half-width, written straight into preallocated bounds
+        if len(predictions) > 1:
+            std = predictions.std(dtype=np.float64)
+        else:
+            std = predictions[0] * 0.1
+        offset = float(1.96 * std)
+        lower = np.subtract(predictions, offset, out=np.empty_like(predictions))
+        upper = np.add(predictions, offset, out=np.empty_like(predictions))
         
         return {
             'forecast': predictions,
@@ -124,10 +199,13 @@ class ServingLayer:
         Returns:
             List of model names
         """
-        models = []
-        for path in self.registry_path.glob("*.joblib"):
-            models.append(path.stem)
-        return models
+        # os.scandir exposes names without building a Path per entry
+        with os.scandir(self.registry_path) as entries:
+            return [
+                entry.name[:-len('.joblib')]
+                for entry in entries
+                if entry.name.endswith('.joblib') and entry.is_file(follow_symlinks=False)
+            ]
 
 
 
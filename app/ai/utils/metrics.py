@@ -2,7 +2,43 @@
 
 from typing import Dict, Any
 import numpy as np
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from ..pipeline._kernels import NUMBA_AVAILABLE, NUMBA_MIN_ROWS, njit, prange
+
+# Reassociation lets the reductions vectorize; the no-NaN fast-math flag is
+# left off because the kernels must skip NaN like np.nanmean/np.nanstd
+_FASTMATH = {'reassoc', 'contract', 'arcp', 'nsz', 'afn'}
+
+
+@njit('UniTuple(float64, 2)(float64[:])', cache=True, parallel=True, fastmath=_FASTMATH)
+def _nan_mean_std(values):
+    """NaN-skipping mean and population std (matches np.nanmean/np.nanstd)."""
+    total = 0.0
+    count = 0
+    for i in prange(values.shape[0]):
+        v = values[i]
+        if not np.isnan(v):
+            total += v
+            count += 1
+    if count == 0:
+        return np.nan, np.nan
+    mean = total / count
+    
+    # Second pass on centered values keeps the variance numerically stable
+    ssq = 0.0
+    for i in prange(values.shape[0]):
+        v = values[i]
+        if not np.isnan(v):
+            ssq += (v - mean) * (v - mean)
+    return mean, np.sqrt(ssq / count)
+
+
+@njit('float64[:](float64[:], float64, float64)', cache=True, parallel=True, fastmath=_FASTMATH)
+def _abs_scaled_deviation(values, center, scale):
+    """Fused ``abs((values - center) / scale)`` in a single pass."""
+    scores = np.empty_like(values)
+    for i in prange(values.shape[0]):
+        scores[i] = abs((values[i] - center) / scale)
+    return scores
 
 
 def evaluate_regression(
@@ -20,31 +56,52 @@ def evaluate_regression(
         predictions: Optional pre-computed predictions
         
     Returns:
-        Dictionary with metrics
+        Dictionary with metrics (Python floats)
+    
+    Inputs are held as float32 to halve memory traffic; every reduction
+    accumulates in float64, so the metrics keep full precision.
     """
     if predictions is None:
         predictions = model.predict(X)
     
-    y_true = np.array(y)
-    y_pred = np.array(predictions)
+    y_true = np.asarray(y, dtype=np.float32)
+    y_pred = np.asarray(predictions, dtype=np.float32)
+    
+    # Remove any NaN values (skipped when both arrays are NaN-free)
+    mask = np.isnan(y_true) | np.isnan(y_pred)
+    if mask.any():
+        y_true = y_true[~mask]
+        y_pred = y_pred[~mask]
+    if y_true.size == 0:
+        raise ValueError("No non-NaN target/prediction pairs to evaluate")
     
-    # Remove any NaN values
-    mask = ~(np.isnan(y_true) | np.isnan(y_pred))
-    y_true = y_true[mask]
-    y_pred = y_pred[mask]
+    # Shared intermediates, each computed once
+    diff = y_true - y_pred
+    abs_diff = np.abs(diff)
     
-    mae = mean_absolute_error(y_true, y_pred)
-    mse = mean_squared_error(y_true, y_pred)
+    mae = abs_diff.mean(dtype=np.float64)
+    mse = np.square(diff, dtype=np.float64).mean()
     rmse = np.sqrt(mse)
-    r2 = r2_score(y_true, y_pred)
+    
+    # R^2 (same constant-target convention as sklearn's r2_score)
+    centered = y_true - y_true.mean(dtype=np.float64)
+    sst = np.square(centered, dtype=np.float64).sum()
+    if sst == 0:
+        r2 = 1.0 if mse == 0 else 0.0
+    else:
+        r2 = 1.0 - mse * diff.size / sst
+    
+    # Percentage errors skip zero denominators instead of adding an epsilon
+    abs_true = np.abs(y_true)
+    sum_abs = abs_true + np.abs(y_pred)
     
     # Calculate MAPE (Mean Absolute Percentage Error)
-    with np.errstate(divide='ignore', invalid='ignore'):
-        mape = np.mean(np.abs((y_true - y_pred) / (y_true + 1e-10))) * 100
+    valid = abs_true > 0
+    mape = (abs_diff[valid] / abs_true[valid]).mean(dtype=np.float64) * 100 if valid.any() else np.nan
     
     # Calculate SMAPE (Symmetric Mean Absolute Percentage Error)
-    with np.errstate(divide='ignore', invalid='ignore'):
-        smape = np.mean(200 * np.abs(y_true - y_pred) / (np.abs(y_true) + np.abs(y_pred) + 1e-10))
+    valid = sum_abs > 0
+    smape = (2 * abs_diff[valid] / sum_abs[valid]).mean(dtype=np.float64) * 100 if valid.any() else np.nan
     
     return {
         'mae': float(mae),
@@ -71,21 +128,44 @@ def calculate_anomaly_scores(
     Returns:
         Array of anomaly scores (higher = more anomalous)
     """
+    # Large 1-D numeric arrays take the fused Numba kernels; small ones stay in
+    # NumPy, where the kernel dispatch cost would dominate
+    use_numba = (
+        NUMBA_AVAILABLE
+        and isinstance(values, np.ndarray)
+        and values.ndim == 1
+        and (np.issubdtype(values.dtype, np.floating) or np.issubdtype(values.dtype, np.integer))
+        and values.size > NUMBA_MIN_ROWS
+    )
+    if use_numba:
+        # The kernels are compiled for writable float64 (float32 and integer
+        # input is upcast; copy-on-write views are read-only). Scores are cast
+        # back so the output dtype matches the NumPy branch: the input's float
+        # dtype, or float64 for integers.
+        out_dtype = values.dtype if np.issubdtype(values.dtype, np.floating) else np.dtype(np.float64)
+        values = np.require(values, dtype=np.float64, requirements=['C', 'W'])
+    
     if method == 'zscore':
-        mean = np.nanmean(values)
-        std = np.nanstd(values)
+        if use_numba:
+            mean, std = _nan_mean_std(values)
+        else:
+            mean = np.nanmean(values)
+            std = np.nanstd(values)
         if std == 0:
-            return np.zeros_like(values)
+            return np.zeros_like(values, dtype=out_dtype) if use_numba else np.zeros_like(values)
+        if use_numba:
+            return _abs_scaled_deviation(values, mean, std).astype(out_dtype, copy=False)
         scores = np.abs((values - mean) / std)
         return scores
     
     elif method == 'iqr':
-        q1 = np.nanpercentile(values, 25)
-        q3 = np.nanpercentile(values, 75)
+        q1, median, q3 = np.nanpercentile(values, [25, 50, 75])
         iqr = q3 - q1
         if iqr == 0:
-            return np.zeros_like(values)
-        scores = np.abs((values - np.nanmedian(values)) / iqr)
+            return np.zeros_like(values, dtype=out_dtype) if use_numba else np.zeros_like(values)
+        if use_numba:
+            return _abs_scaled_deviation(values, median, iqr).astype(out_dtype, copy=False)
+        scores = np.abs((values - median) / iqr)
         return scores
     
     else:
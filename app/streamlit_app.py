@@ -1,7 +1,9 @@
 """Main Streamlit application entrypoint."""
 
+import importlib
 import sys
 from pathlib import Path
+from typing import Callable
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
@@ -9,10 +11,16 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 import streamlit as st
-from streamlit_option_menu import option_menu
 from app.ui.theme.manager import inject_theme
 from app.ui.state.manager import StateManager
 
+# Optional import: fall back to a native selectbox without option_menu
+try:
+    from streamlit_option_menu import option_menu
+    OPTION_MENU_AVAILABLE = True
+except ImportError:
+    OPTION_MENU_AVAILABLE = False
+
 # Page configuration
 st.set_page_config(
     page_title="Wastewater Analytics & Hybrid-AI",
@@ -24,6 +32,61 @@ st.set_page_config(
 # Inject theme
 theme_manager = inject_theme()
 
+
+@st.cache_resource(show_spinner=False)
+def _warm_up_numba_kernels() -> bool:
+    """Load the compiled Numba kernels once per server process."""
+    from app.ai.pipeline._kernels import warm_up_kernels
+    warm_up_kernels()
+    return True
+
+
+_warm_up_numba_kernels()
+
+# Navigation label -> page module (each exposes a render() function)
+PAGES = {
+    "🏠 Dashboard": "app.ui.pages.dashboard",
+    "🤖 AI Training Studio": "app.ui.pages.training_studio",
+    "📊 Forecasting Hub": "app.ui.pages.forecasting",
+    "🚨 Anomaly Detection": "app.ui.pages.anomaly_detection",
+    "🔍 Explainability Lab": "app.ui.pages.explainability",
+    "📈 Benchmarking Suite": "app.ui.pages.benchmarking",
+    "🧾 Reporting": "app.ui.pages.reporting",
+}
+
+MENU_ICONS = [
+    "house",
+    "cpu",
+    "graph-up",
+    "exclamation-triangle",
+    "search",
+    "bar-chart",
+    "file-earmark-text",
+]
+
+MENU_STYLES = {
+    "container": {"padding": "0", "background-color": "white"},
+    "icon": {"color": "#1f77b4", "font-size": "18px"},
+    "nav-link": {
+        "font-size": "16px",
+        "text-align": "left",
+        "margin": "0px",
+        "--hover-color": "#e8f4f8",
+    },
+    "nav-link-selected": {"background-color": "#1f77b4"},
+}
+
+
+@st.cache_resource(show_spinner=False)
+def _load_page(module_name: str) -> Callable[[], None]:
+    """Import a page module on first visit and return its render function.
+    
+    Pages are loaded lazily, so heavy dependencies (Prophet, SHAP, ...) are
+    only imported for pages the user opens, and at most once per process.
+    """
+    return importlib.import_module(module_name).render
+
+
 # Initialize session state
 StateManager.init_session_state()
 
@@ -47,82 +110,37 @@ with st.sidebar:
         unsafe_allow_html=True,
     )
     
-    # Use native Streamlit selectbox as workaround for pyarrow requirement
-    try:
-        selection = option_menu(
-            menu_title=None,
-            options=[
-                "🏠 Dashboard",
-                "🤖 AI Training Studio",
-                "📊 Forecasting Hub",
-                "🚨 Anomaly Detection",
-                "🔍 Explainability Lab",
-                "📈 Benchmarking Suite",
-                "🧾 Reporting",
-            ],
-            icons=[
-                "house",
-                "cpu",
-                "graph-up",
-                "exclamation-triangle",
-                "search",
-                "bar-chart",
-                "file-earmark-text",
-            ],
-            menu_icon="water",
-            default_index=0,
-            styles={
-                "container": {"padding": "0", "background-color": "white"},
-                "icon": {"color": "#1f77b4", "font-size": "18px"},
-                "nav-link": {
-                    "font-size": "16px",
-                    "text-align": "left",
-                    "margin": "0px",
-                    "--hover-color": "#e8f4f8",
-                },
-                "nav-link-selected": {"background-color": "#1f77b4"},
-            },
-        )
-    except Exception:
-        # Fallback to native Streamlit selectbox if option_menu fails
+    # The backend is chosen once per session: after option_menu fails, later
+    # reruns go straight to the native selectbox (no repeated try/except)
+    if '_menu_backend' not in st.session_state:
+        st.session_state._menu_backend = 'option_menu' if OPTION_MENU_AVAILABLE else 'selectbox'
+    
+    if st.session_state._menu_backend == 'option_menu':
+        try:
+            selection = option_menu(
+                menu_title=None,
+                options=list(PAGES),
+                icons=MENU_ICONS,
+                menu_icon="water",
+                default_index=0,
+                styles=MENU_STYLES,
+            )
+        except Exception:
+            st.session_state._menu_backend = 'selectbox'
+    
+    if st.session_state._menu_backend == 'selectbox':
+        # Use native Streamlit selectbox as workaround for pyarrow requirement
         selection = st.selectbox(
             "📋 Navigation",
-            options=[
-                "🏠 Dashboard",
-                "🤖 AI Training Studio",
-                "📊 Forecasting Hub",
-                "🚨 Anomaly Detection",
-                "🔍 Explainability Lab",
-                "📈 Benchmarking Suite",
-                "🧾 Reporting",
-            ],
+            options=list(PAGES),
             key="page_selector",
         )
 
 # Error boundary wrapper
 try:
     # Route to appropriate page
-    if selection == "🏠 Dashboard":
-        from app.ui.pages.dashboard import render
-        render()
-    elif selection == "🤖 AI Training Studio":
-        from app.ui.pages.training_studio import render
-        render()
-    elif selection == "📊 Forecasting Hub":
-        from app.ui.pages.forecasting import render
-        render()
-    elif selection == "🚨 Anomaly Detection":
-        from app.ui.pages.anomaly_detection import render
-        render()
-    elif selection == "🔍 Explainability Lab":
-        from app.ui.pages.explainability import render
-        render()
-    elif selection == "📈 Benchmarking Suite":
-        from app.ui.pages.benchmarking import render
-        render()
-    elif selection == "🧾 Reporting":
-        from app.ui.pages.reporting import render
-        render()
+    if selection in PAGES:
+        _load_page(PAGES[selection])()
     else:
         st.error("Page not found")
 except Exception as e:
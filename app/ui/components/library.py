@@ -10,14 +10,14 @@ class ComponentLibrary:
     """Library of reusable UI components."""
     
     @staticmethod
-    def kpi_card(
+    def kpi_html(
         title: str,
         value: str,
         delta: Optional[str] = None,
         delta_type: Optional[str] = None,
         icon: Optional[str] = None,
-    ) -> None:
-        """Render a KPI card with optional delta indicator.
+    ) -> str:
+        """Build the HTML for a KPI card without rendering it.
         
         Args:
             title: KPI title
@@ -25,6 +25,9 @@ class ComponentLibrary:
             delta: Change indicator (e.g., "+5.2%", "-3.1%")
             delta_type: "up" or "down" for styling
             icon: Optional emoji or icon character
+            
+        Returns:
+            HTML string for one ``kpi-card``
         """
         icon_text = f"{icon} " if icon else ""
         delta_html = ""
@@ -32,13 +35,32 @@ class ComponentLibrary:
             delta_class = f"up" if delta_type == "up" else "down"
             delta_html = f'<div class="kpi-delta {delta_class}">{delta}</div>'
         
-        html = f"""
-        <div class="kpi-card">
-            <div class="kpi-title">{icon_text}{title}</div>
-            <div class="kpi-value">{value}</div>
-            {delta_html}
-        </div>
+        return (
+            f'<div class="kpi-card">'
+            f'<div class="kpi-title">{icon_text}{title}</div>'
+            f'<div class="kpi-value">{value}</div>'
+            f'{delta_html}'
+            f'</div>'
+        )
+    
+    @staticmethod
+    def kpi_card(
+        title: str,
+        value: str,
+        delta: Optional[str] = None,
+        delta_type: Optional[str] = None,
+        icon: Optional[str] = None,
+    ) -> None:
+        """Render a KPI card with optional delta indicator.
+        
+        Args:
+            title: KPI title
+            value: Main value to display
+            delta: Change indicator (e.g., "+5.2%", "-3.1%")
+            delta_type: "up" or "down" for styling
+            icon: Optional emoji or icon character
         """
+        html = ComponentLibrary.kpi_html(title, value, delta, delta_type, icon)
         st.markdown(html, unsafe_allow_html=True)
     
     @staticmethod
@@ -173,38 +195,45 @@ class ComponentLibrary:
         Args:
             stats: Dict with keys like 'missing_pct', 'duplicates', 'rows', 'columns', etc.
         """
-        col1, col2, col3, col4 = st.columns(4)
+        missing_pct = stats.get('missing_pct', 0)
+        duplicates = stats.get('duplicates', 0)
         
-        with col1:
-            ComponentLibrary.kpi_card(
+        # One flex row and a single st.markdown call instead of four columns
+        html = (
+            '<div class="kpi-row">'
+            + ComponentLibrary.kpi_html(
                 "Total Rows",
                 f"{stats.get('rows', 0):,}",
                 icon="📊",
             )
-        with col2:
-            ComponentLibrary.kpi_card(
+            + ComponentLibrary.kpi_html(
                 "Columns",
                 f"{stats.get('columns', 0)}",
                 icon="📋",
             )
-        with col3:
-            missing_pct = stats.get('missing_pct', 0)
-            ComponentLibrary.kpi_card(
+            + ComponentLibrary.kpi_html(
                 "Missing Data",
                 f"{missing_pct:.1f}%",
                 delta_type="up" if missing_pct < 5 else "down",
                 icon="⚠️",
             )
-        with col4:
-            ComponentLibrary.kpi_card(
+            + ComponentLibrary.kpi_html(
                 "Duplicates",
-                f"{stats.get('duplicates', 0):,}",
-                delta_type="up" if stats.get('duplicates', 0) == 0 else "down",
+                f"{duplicates:,}",
+                delta_type="up" if duplicates == 0 else "down",
                 icon="🔍",
             )
+            + '</div>'
+        )
         
         if stats.get('date_range'):
-            st.info(f"📅 Date Range: {stats['date_range'][0]} to {stats['date_range'][1]}")
+            html += (
+                '<div class="alert-banner alert-info">'
+                f"📅 Date Range: {stats['date_range'][0]} to {stats['date_range'][1]}"
+                '</div>'
+            )
+        
+        st.markdown(html, unsafe_allow_html=True)
 
 
 # Convenience instances
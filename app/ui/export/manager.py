@@ -1,62 +1,239 @@
 """Export manager for generating reports."""
 
+import functools
+import hashlib
+import io
+import os
+import pickle
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, LongTable, TableStyle, PageBreak
 from reportlab.lib import colors
 from pptx import Presentation
 from pptx.util import Inches, Pt
 import plotly.graph_objects as go
 import plotly.io as pio
 
+# Write buffer for HTML reports (1 MiB instead of the 8 KiB default)
+HTML_WRITE_BUFFER = 1 << 20
+
+# HTML report templates, filled with str.format (CSS braces are doubled)
+_HTML_HEADER = """<!DOCTYPE html>
+<html>
+<head>
+    <title>{title}</title>
+    <style>
+        body {{ font-family: Inter, sans-serif; margin: 40px; background: #f8f9fa; }}
+        .header {{ background: linear-gradient(135deg, #1f77b4 0%, #2a5f8f 100%); color: white; padding: 30px; border-radius: 8px; }}
+        .section {{ background: white; padding: 20px; margin: 20px 0; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1); }}
+        table {{ width: 100%; border-collapse: collapse; }}
+        th {{ background: #1f77b4; color: white; padding: 12px; text-align: left; }}
+        td {{ padding: 10px; border-bottom: 1px solid #ddd; }}
+        tr:hover {{ background: #f5f5f5; }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>{title}</h1>
+        <p>{subtitle}</p>
+        <p>Generated: {date} | Author: {author}</p>
+    </div>
+    
+    <div class="section">
+        <h2>Dataset Overview</h2>
+        <p>Total Records: {n_records:,}</p>
+        <p>Features: {n_features}</p>
+    </div>
+"""
+
+_HTML_KPI_SECTION = """
+    <div class="section">
+        <h2>Key Performance Indicators</h2>
+        {table}
+    </div>
+"""
+
+_HTML_FOOTER = """
+</body>
+</html>
+"""
+
+# PDF styles, built once and only read while rendering (safe to share
+# across the generate_all worker threads)
+_PDF_STYLES = getSampleStyleSheet()
+_PDF_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_PDF_STYLES['Heading1'],
+    fontSize=24,
+    textColor=colors.HexColor('#1f77b4'),
+    spaceAfter=30,
+)
+_PDF_KPI_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+])
+_PDF_RAW_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 8),
+    ('FONTSIZE', (0, 1), (-1, -1), 7),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+])
+
+
+def _blank_pptx_bytes() -> bytes:
+    """Serialize the default template with the report slide size applied."""
+    prs = Presentation()
+    prs.slide_width = Inches(10)
+    prs.slide_height = Inches(7.5)
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+
+# Blank deck every PPTX report starts from (opened from memory per report)
+_BLANK_PPTX = _blank_pptx_bytes()
+
+
+def _cached_report(ext: str):
+    """Reuse a previously rendered report for identical data and metadata.
+    
+    Only active when the ExportManager has a ``cache_dir``. Reports are keyed
+    by a hash of the frame contents, its columns and the metadata; a hit is
+    copied to the usual output path instead of being rendered again.
+    """
+    def decorator(generate):
+        @functools.wraps(generate)
+        def wrapper(self, df: pd.DataFrame, metadata: Dict[str, Any], timestamp: Optional[str] = None) -> str:
+            if self.cache_dir is None:
+                return generate(self, df, metadata, timestamp)
+            
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(pd.util.hash_pandas_object(df).to_numpy().tobytes())
+            digest.update(pickle.dumps((list(df.columns), sorted(metadata.items(), key=str))))
+            cached = self.cache_dir / f"{digest.hexdigest()}.{ext}"
+            if cached.exists():
+                filepath = self._report_path(ext, timestamp)
+                shutil.copyfile(cached, filepath)
+                return str(filepath)
+            
+            report_path = generate(self, df, metadata, timestamp)
+            # Copy under a temporary name first so a concurrent reader never
+            # sees a partially written cache entry
+            tmp = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+            shutil.copyfile(report_path, tmp)
+            os.replace(tmp, cached)
+            return report_path
+        return wrapper
+    return decorator
+
 
 class ExportManager:
     """Manages report generation in various formats."""
     
-    def __init__(self, output_dir: Optional[str] = None):
+    def __init__(self, output_dir: Optional[str] = None, cache_dir: Optional[str] = None):
         """Initialize export manager.
         
         Args:
             output_dir: Output directory for reports
+            cache_dir: Optional directory of content-addressed reports; when
+                set, identical data and metadata reuse an earlier rendering
         """
         self.output_dir = Path(output_dir) if output_dir else Path("reports")
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def report_timestamp() -> str:
+        """Return the timestamp used in report filenames.
+        
+        Pass one value to several ``generate_*_report`` calls to give the
+        files a shared suffix.
+        """
+        return datetime.now().strftime('%Y%m%d_%H%M%S')
+    
+    def _report_path(self, ext: str, timestamp: Optional[str] = None) -> Path:
+        """Build the output path for a report with the given extension."""
+        return self.output_dir / f"wastewater_report_{timestamp or self.report_timestamp()}.{ext}"
+    
+    def _compute_kpi_table(self, df: pd.DataFrame, limit: int) -> pd.DataFrame:
+        """Compute KPI statistics for the first ``limit`` numeric columns.
+        
+        Args:
+            df: Dataset to summarize
+            limit: Maximum number of numeric columns
+            
+        Returns:
+            DataFrame indexed by column name with mean/min/max/std/median
+            columns, produced by a single ``agg`` over the numeric block
+        """
+        stats = ['mean', 'min', 'max', 'std', 'median']
+        numeric = df.select_dtypes(include=[np.number]).iloc[:, :limit]
+        if numeric.columns.empty:
+            return pd.DataFrame(columns=stats, dtype=float)
+        return numeric.agg(stats).T
     
+    def _format_kpi_rows(self, df: pd.DataFrame, limit: int, stats: Sequence[str]) -> List[List[str]]:
+        """Format the KPI table as rows of strings, ready for a table API.
+        
+        Args:
+            df: Dataset to summarize
+            limit: Maximum number of numeric columns
+            stats: Statistics to include, in column order
+            
+        Returns:
+            List of ``[column name, *values]`` rows with values formatted to
+            two decimals in one ``np.char.mod`` call
+        """
+        kpi = self._compute_kpi_table(df, limit)
+        values = np.char.mod('%.2f', kpi[list(stats)].to_numpy(dtype=np.float64))
+        return np.column_stack([kpi.index.astype(str), values]).tolist()
+    
+    @_cached_report('pdf')
     def generate_pdf_report(
         self,
         df: pd.DataFrame,
         metadata: Dict[str, Any],
+        timestamp: Optional[str] = None,
     ) -> str:
         """Generate PDF report.
         
         Args:
             df: Dataset to include
             metadata: Report metadata
+            timestamp: Filename suffix; defaults to ``report_timestamp()``
             
         Returns:
             Path to generated PDF
         """
-        filename = f"wastewater_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        filepath = self.output_dir / filename
+        filepath = self._report_path('pdf', timestamp)
         
-        doc = SimpleDocTemplate(str(filepath), pagesize=letter)
+        # Render in memory and write the file in one call
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=letter)
         story = []
-        styles = getSampleStyleSheet()
+        styles = _PDF_STYLES
         
         # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1f77b4'),
-            spaceAfter=30,
-        )
-        story.append(Paragraph(metadata['title'], title_style))
+        story.append(Paragraph(metadata['title'], _PDF_TITLE_STYLE))
         story.append(Paragraph(metadata['subtitle'], styles['Normal']))
         story.append(Paragraph(f"Generated: {metadata['date']}", styles['Normal']))
         story.append(Paragraph(f"Author: {metadata['author']}", styles['Normal']))
@@ -73,28 +250,10 @@ class ExportManager:
         
         if 'KPIs' in metadata['sections']:
             story.append(Paragraph("Key Performance Indicators", styles['Heading2']))
-            numeric_cols = df.select_dtypes(include=['number']).columns[:5]
-            
-            kpi_data = [['Metric', 'Mean', 'Min', 'Max']]
-            for col in numeric_cols:
-                kpi_data.append([
-                    col,
-                    f"{df[col].mean():.2f}",
-                    f"{df[col].min():.2f}",
-                    f"{df[col].max():.2f}",
-                ])
+            kpi_data = [['Metric', 'Mean', 'Min', 'Max']] + self._format_kpi_rows(df, 5, ['mean', 'min', 'max'])
             
             table = Table(kpi_data)
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ]))
+            table.setStyle(_PDF_KPI_TABLE_STYLE)
             story.append(table)
             story.append(Spacer(1, 0.3*inch))
         
@@ -102,42 +261,38 @@ class ExportManager:
             story.append(Paragraph("Raw Data Sample", styles['Heading2']))
             # Add sample table (limit rows for PDF)
             sample_df = df.head(20)
-            table_data = [list(sample_df.columns)] + sample_df.values.tolist()
-            table = Table(table_data)
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 8),
-                ('FONTSIZE', (0, 1), (-1, -1), 7),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ]))
+            # Plain row tuples; LongTable splits across pages without
+            # re-measuring the whole table for every page
+            table_data = [tuple(sample_df.columns)]
+            table_data += sample_df.itertuples(index=False, name=None)
+            table = LongTable(table_data, repeatRows=1)
+            table.setStyle(_PDF_RAW_TABLE_STYLE)
             story.append(table)
         
         doc.build(story)
+        filepath.write_bytes(buffer.getvalue())
         return str(filepath)
     
+    @_cached_report('pptx')
     def generate_pptx_report(
         self,
         df: pd.DataFrame,
         metadata: Dict[str, Any],
+        timestamp: Optional[str] = None,
     ) -> str:
         """Generate PowerPoint report.
         
         Args:
             df: Dataset to include
             metadata: Report metadata
+            timestamp: Filename suffix; defaults to ``report_timestamp()``
             
         Returns:
             Path to generated PPTX
         """
-        filename = f"wastewater_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pptx"
-        filepath = self.output_dir / filename
+        filepath = self._report_path('pptx', timestamp)
         
-        prs = Presentation()
-        prs.slide_width = Inches(10)
-        prs.slide_height = Inches(7.5)
+        prs = Presentation(io.BytesIO(_BLANK_PPTX))
         
         # Title slide
         slide = prs.slides.add_slide(prs.slide_layouts[0])
@@ -154,8 +309,8 @@ class ExportManager:
             title.text = "Key Performance Indicators"
             
             # Add table with KPIs
-            numeric_cols = df.select_dtypes(include=['number']).columns[:5]
-            rows = min(6, len(numeric_cols) + 1)
+            kpi_rows = self._format_kpi_rows(df, 5, ['mean', 'min', 'max'])
+            rows = min(6, len(kpi_rows) + 1)
             cols = 4
             
             left = Inches(1)
@@ -166,111 +321,99 @@ class ExportManager:
             table = slide.shapes.add_table(rows, cols, left, top, width, height).table
             table.columns[0].width = Inches(2)
             
-            # Header row
-            table.cell(0, 0).text = "Metric"
-            table.cell(0, 1).text = "Mean"
-            table.cell(0, 2).text = "Min"
-            table.cell(0, 3).text = "Max"
-            
-            # Data rows
-            for i, col in enumerate(numeric_cols[:5], 1):
-                if i < rows:
-                    table.cell(i, 0).text = col[:20]
-                    table.cell(i, 1).text = f"{df[col].mean():.2f}"
-                    table.cell(i, 2).text = f"{df[col].min():.2f}"
-                    table.cell(i, 3).text = f"{df[col].max():.2f}"
+            # Header and data rows: fetch each row's cells once instead of
+            # a table.cell() lookup per cell
+            header = ["Metric", "Mean", "Min", "Max"]
+            for row, values in zip(table.rows, [header] + kpi_rows[:rows - 1]):
+                for cell, text in zip(row.cells, [values[0][:20], *values[1:]]):
+                    cell.text = text
         
-        prs.save(str(filepath))
+        buffer = io.BytesIO()
+        prs.save(buffer)
+        filepath.write_bytes(buffer.getvalue())
         return str(filepath)
     
+    @_cached_report('html')
     def generate_html_report(
         self,
         df: pd.DataFrame,
         metadata: Dict[str, Any],
+        timestamp: Optional[str] = None,
     ) -> str:
         """Generate HTML report.
         
         Args:
             df: Dataset to include
             metadata: Report metadata
+            timestamp: Filename suffix; defaults to ``report_timestamp()``
             
         Returns:
             Path to generated HTML
         """
-        filename = f"wastewater_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-        filepath = self.output_dir / filename
+        filepath = self._report_path('html', timestamp)
         
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>{metadata['title']}</title>
-            <style>
-                body {{ font-family: Inter, sans-serif; margin: 40px; background: #f8f9fa; }}
-                .header {{ background: linear-gradient(135deg, #1f77b4 0%, #2a5f8f 100%); color: white; padding: 30px; border-radius: 8px; }}
-                .section {{ background: white; padding: 20px; margin: 20px 0; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1); }}
-                table {{ width: 100%; border-collapse: collapse; }}
-                th {{ background: #1f77b4; color: white; padding: 12px; text-align: left; }}
-                td {{ padding: 10px; border-bottom: 1px solid #ddd; }}
-                tr:hover {{ background: #f5f5f5; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>{metadata['title']}</h1>
-                <p>{metadata['subtitle']}</p>
-                <p>Generated: {metadata['date']} | Author: {metadata['author']}</p>
-            </div>
+        with open(filepath, 'w', encoding='utf-8', buffering=HTML_WRITE_BUFFER) as f:
+            f.write(_HTML_HEADER.format(
+                title=metadata['title'],
+                subtitle=metadata['subtitle'],
+                date=metadata['date'],
+                author=metadata['author'],
+                n_records=len(df),
+                n_features=len(df.columns),
+            ))
             
-            <div class="section">
-                <h2>Dataset Overview</h2>
-                <p>Total Records: {len(df):,}</p>
-                <p>Features: {len(df.columns)}</p>
-            </div>
-        """
+            if 'KPIs' in metadata['sections']:
+                kpi_rows = self._format_kpi_rows(df, 10, ['mean', 'min', 'max', 'std'])
+                # pandas renders the whole table in one call instead of a row loop
+                kpi_table = pd.DataFrame(
+                    kpi_rows, columns=['Metric', 'Mean', 'Min', 'Max', 'Std Dev'],
+                ).to_html(index=False, border=0)
+                f.write(_HTML_KPI_SECTION.format(table=kpi_table))
+            
+            f.write(_HTML_FOOTER)
         
-        if 'KPIs' in metadata['sections']:
-            numeric_cols = df.select_dtypes(include=['number']).columns[:10]
-            html_content += """
-            <div class="section">
-                <h2>Key Performance Indicators</h2>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Metric</th>
-                            <th>Mean</th>
-                            <th>Min</th>
-                            <th>Max</th>
-                            <th>Std Dev</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-            """
-            for col in numeric_cols:
-                html_content += f"""
-                        <tr>
-                            <td>{col}</td>
-                            <td>{df[col].mean():.2f}</td>
-                            <td>{df[col].min():.2f}</td>
-                            <td>{df[col].max():.2f}</td>
-                            <td>{df[col].std():.2f}</td>
-                        </tr>
-                """
-            html_content += """
-                    </tbody>
-                </table>
-            </div>
-            """
+        return str(filepath)
+    
+    def generate_all(
+        self,
+        df: pd.DataFrame,
+        metadata: Dict[str, Any],
+        formats: Sequence[str] = ('pdf', 'pptx', 'html'),
+    ) -> Dict[str, str]:
+        """Generate several report formats concurrently.
+        
+        The reports are independent files, so they are rendered on one thread
+        each; the files share a timestamp suffix. ``df`` is only read.
         
-        html_content += """
-        </body>
-        </html>
+        Args:
+            df: Dataset to include
+            metadata: Report metadata
+            formats: Any of 'pdf', 'pptx' and 'html'
+            
+        Returns:
+            Dictionary mapping each format to its generated path, in the
+            order of ``formats``
         """
+        generators = {
+            'pdf': self.generate_pdf_report,
+            'pptx': self.generate_pptx_report,
+            'html': self.generate_html_report,
+        }
+        unknown = [fmt for fmt in formats if fmt not in generators]
+        if unknown:
+            raise ValueError(f"Unsupported report formats: {unknown}")
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        timestamp = self.report_timestamp()
+        paths = {}
+        with ThreadPoolExecutor(max_workers=max(1, len(formats))) as executor:
+            futures = {
+                executor.submit(generators[fmt], df, metadata, timestamp): fmt
+                for fmt in formats
+            }
+            for future in as_completed(futures):
+                paths[futures[future]] = future.result()
         
-        return str(filepath)
+        return {fmt: paths[fmt] for fmt in formats}
 
 
 
@@ -8,6 +8,9 @@ from app.ui.components.library import ComponentLibrary
 from app.ui.state.manager import StateManager
 from app.ai.utils.metrics import calculate_anomaly_scores
 
+# Severity labels indexed by np.searchsorted over the score thresholds
+SEVERITY_LABELS = np.array(['Low', 'Medium', 'High'])
+
 
 def render():
     """Render the Anomaly Detection Center page."""
@@ -24,7 +27,7 @@ def render():
     # Configuration
     st.markdown("### ⚙️ Detection Configuration")
     
-    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+    numeric_cols = StateManager.get_numeric_cols()
     target_col = st.selectbox("Target Variable", numeric_cols[:10])
     
     method = st.selectbox("Detection Method", ["zscore", "iqr"])
@@ -74,43 +77,53 @@ def render():
         st.markdown("### 📊 Anomaly Timeline")
         
         # Create timeline plot
-        values = df[target_col_result].dropna().values
-        dates = pd.date_range(end=pd.Timestamp.now(), periods=len(values), freq='D') if len(values) <= 1000 else None
-        
-        if dates is None:
-            x_vals = np.arange(len(values))
+        # Same rows as detection (target non-null), plotted against the
+        # detected date column (cached per dataset) when there is one
+        valid = df[target_col_result].notna().to_numpy()
+        values = df[target_col_result].to_numpy()[valid]
+        date_col = StateManager.get_schema()['date_column']
+        if date_col:
+            x_vals = df[date_col].to_numpy()[valid]
         else:
-            x_vals = dates
-        
-        fig = go.Figure()
+            x_vals = np.arange(len(values))
         
         # Normal values
-        normal_mask = ~np.isin(np.arange(len(values)), results['indices'])
-        fig.add_trace(go.Scatter(
+        # One scatter into a preallocated mask (no arange + hash-based isin)
+        normal_mask = np.ones(len(values), dtype=np.bool_)
+        normal_mask[results['indices']] = False
+        normal_trace = dict(
+            type='scatter',
             x=x_vals[normal_mask],
             y=values[normal_mask],
             mode='markers',
             name='Normal',
             marker=dict(color='#1f77b4', size=4),
-        ))
+        )
         
         # Anomalies
-        fig.add_trace(go.Scatter(
+        anomaly_trace = dict(
+            type='scatter',
             x=x_vals[results['indices']],
             y=results['values'],
             mode='markers',
             name='Anomaly',
             marker=dict(color='#ff7f0e', size=8, symbol='triangle-up'),
-            text=[f"Score: {s:.2f}" for s in results['scores']],
-            hovertemplate='Value: %{y}<br>Score: %{text}<extra></extra>',
-        ))
+            # Plotly formats the scores client-side (no per-point Python strings)
+            customdata=np.asarray(results['scores'], dtype=np.float64),
+            hovertemplate='Value: %{y}<br>Score: %{customdata:.2f}<extra></extra>',
+        )
         
-        fig.update_layout(
-            title=f"Anomaly Detection: {target_col_result}",
-            xaxis_title="Time",
-            yaxis_title=target_col_result,
-            height=500,
-            hovermode='closest',
+        # Traces and layout go through Plotly's validators in one constructor
+        # call instead of add_trace per trace plus update_layout
+        fig = go.Figure(
+            data=[normal_trace, anomaly_trace],
+            layout=dict(
+                title=f"Anomaly Detection: {target_col_result}",
+                xaxis=dict(title="Time"),
+                yaxis=dict(title=target_col_result),
+                height=500,
+                hovermode='closest',
+            ),
         )
         
         st.plotly_chart(fig, use_container_width=True)
@@ -119,12 +132,16 @@ def render():
         st.markdown("### 📋 Anomaly Details")
         
         if 'indices' in results and 'values' in results and 'scores' in results:
+            scores = np.asarray(results['scores'])
+            # Right-closed bins (score <= threshold is Low), as pd.cut used
+            severity_idx = np.searchsorted([threshold, threshold * 1.5], scores, side='left')
+            # copy=False keeps each array as its own block (no consolidation copy)
             anomaly_df = pd.DataFrame({
-                'Index': results['indices'],
-                'Value': results['values'],
-                'Anomaly Score': results['scores'],
-                'Severity': pd.cut(results['scores'], bins=[0, threshold, threshold*1.5, 100], labels=['Low', 'Medium', 'High']),
-            })
+                'Index': np.asarray(results['indices']),
+                'Value': np.asarray(results['values']),
+                'Anomaly Score': scores,
+                'Severity': SEVERITY_LABELS[severity_idx],
+            }, copy=False)
         else:
             st.error("Anomaly results incomplete. Please run detection again.")
             return
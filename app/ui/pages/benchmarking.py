@@ -1,5 +1,6 @@
 """Benchmarking Suite page."""
 
+from typing import Any, Dict, List, Optional
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -7,6 +8,44 @@ import plotly.graph_objects as go
 from app.ui.components.library import ComponentLibrary
 from app.ui.state.manager import StateManager
 
+BENCHMARK_STATS = ['mean', 'std', 'min', 'max', 'median']
+
+
+def _benchmark_stats(
+    df: pd.DataFrame,
+    site_col: Optional[str],
+    sites: List[Any],
+    metrics: List[str],
+) -> Dict[Any, Dict[str, Dict[str, float]]]:
+    """Summarize each metric per site with one grouped aggregation.
+    
+    Args:
+        df: Dataset
+        site_col: Site column, or None to summarize the whole dataset as "All"
+        sites: Sites to include, in display order
+        metrics: Numeric columns to summarize
+        
+    Returns:
+        ``{site: {metric: {stat: value}}}``; metrics with no values for a
+        site are omitted
+    """
+    stats = BENCHMARK_STATS + ['count']
+    if site_col:
+        subset = df.loc[df[site_col].isin(sites), [site_col] + metrics]
+        agg = subset.groupby(site_col, observed=True)[metrics].agg(stats).reindex(sites)
+        per_site = {site: agg.loc[site].unstack() for site in sites}
+    else:
+        per_site = {sites[0]: df[metrics].agg(stats).T}
+    
+    return {
+        site: {
+            metric: {stat: float(row[stat]) for stat in BENCHMARK_STATS}
+            for metric, row in table.iterrows()
+            if row['count'] > 0
+        }
+        for site, table in per_site.items()
+    }
+
 
 def render():
     """Render the Benchmarking Suite page."""
@@ -36,7 +75,7 @@ def render():
         site_col = None
     
     # Metrics selection
-    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+    numeric_cols = StateManager.get_numeric_cols()
     metrics = st.multiselect(
         "Select Metrics for Benchmarking",
         numeric_cols[:10],
@@ -50,27 +89,7 @@ def render():
     # Compute benchmark metrics
     if st.button("📊 Generate Benchmark", type="primary"):
         with st.spinner("Computing benchmarks..."):
-            results = {}
-            
-            for site in selected_sites:
-                if site_col:
-                    site_df = df[df[site_col] == site]
-                else:
-                    site_df = df
-                
-                site_metrics = {}
-                for metric in metrics:
-                    values = site_df[metric].dropna()
-                    if len(values) > 0:
-                        site_metrics[metric] = {
-                            'mean': float(values.mean()),
-                            'std': float(values.std()),
-                            'min': float(values.min()),
-                            'max': float(values.max()),
-                            'median': float(values.median()),
-                        }
-                
-                results[site] = site_metrics
+            results = _benchmark_stats(df, site_col, selected_sites, metrics)
             
             st.session_state.benchmark_results = results
             st.success("✅ Benchmark computed!")
@@ -104,6 +123,13 @@ def render():
             # Normalize metrics for radar chart
             fig = go.Figure()
             
+            # Largest site mean per metric (floored at 1), computed once
+            # instead of rescanning every site for each site and metric
+            per_metric_max = {
+                metric: max([results[s][metric]['mean'] for s in selected_sites if metric in results.get(s, {})] + [1])
+                for metric in metrics[:6]
+            }
+            
             for site in selected_sites:
                 if site in results:
                     values = []
@@ -112,8 +138,7 @@ def render():
                     for metric in metrics[:6]:  # Limit to 6 metrics for readability
                         if metric in results[site]:
                             # Normalize to 0-100 scale
-                            normalized = (results[site][metric]['mean'] / 
-                                        max([results[s][metric]['mean'] for s in selected_sites if metric in results.get(s, {})] + [1])) * 100
+                            normalized = results[site][metric]['mean'] / per_metric_max[metric] * 100
                             values.append(normalized)
                             labels.append(metric[:20])  # Truncate long names
                     
@@ -149,20 +174,21 @@ def render():
             period = st.selectbox("Comparison Period", ["Weekly", "Monthly", "Quarterly"])
             
             if st.button("📊 Compare Periods"):
-                # Simple period comparison
-                df_period = df.copy()
-                if not pd.api.types.is_datetime64_any_dtype(df_period[date_col]):
-                    df_period[date_col] = pd.to_datetime(df_period[date_col], errors='coerce')
+                # Simple period comparison: group by an external Series
+                # instead of adding a column to a copy of the whole frame
+                dates = df[date_col]
+                if not pd.api.types.is_datetime64_any_dtype(dates):
+                    dates = pd.to_datetime(dates, errors='coerce')
                 
                 if period == "Weekly":
-                    df_period['period'] = df_period[date_col].dt.isocalendar().week
+                    period_key = dates.dt.isocalendar().week
                 elif period == "Monthly":
-                    df_period['period'] = df_period[date_col].dt.month
+                    period_key = dates.dt.month
                 else:
-                    df_period['period'] = df_period[date_col].dt.quarter
+                    period_key = dates.dt.quarter
                 
                 # Aggregate by period
-                period_agg = df_period.groupby('period')[metrics[0]].mean()
+                period_agg = df[metrics[0]].groupby(period_key.rename('period')).mean()
                 
                 fig = go.Figure()
                 fig.add_trace(go.Bar(
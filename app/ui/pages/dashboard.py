@@ -1,11 +1,100 @@
 """Dashboard page."""
 
+from typing import Any, Dict, Optional, Tuple
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from app.ui.components.library import ComponentLibrary
 from app.ui.state.manager import StateManager
 
+# Most points the trend chart sends to the browser
+TREND_MAX_POINTS = 1000
+
+
+def _downsample(x: np.ndarray, y: np.ndarray, n: int = TREND_MAX_POINTS) -> Tuple[np.ndarray, np.ndarray]:
+    """Stride-sample a series to at most ``n`` points for plotting.
+    
+    Beyond a few thousand points the markers overlap on screen, so this
+    mainly cuts the JSON Plotly sends over the websocket.
+    
+    Args:
+        x: X values
+        y: Y values (same length as ``x``)
+        n: Maximum number of points
+        
+    Returns:
+        Tuple of (x, y) views; unchanged when already within ``n`` points
+    """
+    if len(y) <= n:
+        return x, y
+    step = -(-len(y) // n)  # ceil division keeps the result within n points
+    return x[::step], y[::step]
+
+
+def _last_non_null(col: pd.Series) -> Optional[Any]:
+    """Return the last non-null value of a series, or None if there is none.
+    
+    Looks the value up by its label instead of materializing ``dropna()``.
+    """
+    idx = col.last_valid_index()
+    if idx is None:
+        return None
+    value = col.loc[idx]
+    # A duplicated index label selects several rows; keep the last valid one
+    return value.dropna().iloc[-1] if isinstance(value, pd.Series) else value
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _dashboard_kpis(
+    dataset_key: Optional[str],
+    _df: pd.DataFrame,
+    date_col: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Scan the dataset for the KPI cards once per loaded dataset.
+    
+    Args:
+        dataset_key: ``StateManager.get_dataset_key()``; the cache key
+        _df: Dataset (the leading underscore keeps Streamlit from hashing it)
+        date_col: Detected date column (``StateManager.get_schema()``), if any
+        
+    Returns:
+        Dictionary with 'bod', 'cod', 'avg', 'sites', 'date_range_days' and
+        'date_col'; each is None when the dataset has no matching column
+    """
+    df = _df
+    kpis = {'bod': None, 'cod': None, 'avg': None, 'sites': None, 'date_range_days': None, 'date_col': None}
+    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+    
+    # Lowercase each numeric column name once and bucket it in a single pass;
+    # text columns such as 'plant_code' must never reach the COD card
+    lower_map = {c: str(c).lower() for c in numeric_cols}
+    col_buckets = {'bod': [], 'cod': []}
+    for c, lc in lower_map.items():
+        for tag, bucket in col_buckets.items():
+            if tag in lc:
+                bucket.append(c)
+    
+    # The cards are labelled "Effluent ...", so prefer effluent columns
+    for tag in ('bod', 'cod'):
+        if col_buckets[tag]:
+            col = next((c for c in col_buckets[tag] if 'effluent' in lower_map[c]), col_buckets[tag][0])
+            latest_value = _last_non_null(df[col])
+            if latest_value is not None:
+                kpis[tag] = float(latest_value)
+    
+    if len(numeric_cols) > 0:
+        kpis['avg'] = float(df[numeric_cols[0]].mean())
+    elif 'site_id' in df.columns:
+        kpis['sites'] = int(df['site_id'].nunique())
+    
+    if date_col is not None and date_col in df.columns:
+        kpis['date_col'] = date_col
+        if pd.api.types.is_datetime64_any_dtype(df[date_col]):
+            kpis['date_range_days'] = (df[date_col].max() - df[date_col].min()).days
+    
+    return kpis
+
 
 def render():
     """Render the dashboard page."""
@@ -26,40 +115,30 @@ def render():
     st.markdown("### Key Performance Indicators")
     col1, col2, col3, col4 = st.columns(4)
     
-    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+    numeric_cols = StateManager.get_numeric_cols()
+    kpis = _dashboard_kpis(StateManager.get_dataset_key(), df, StateManager.get_schema()['date_column'])
     
     with col1:
-        if 'bod' in df.columns.str.lower().str.lower().tolist():
-            bod_col = [c for c in df.columns if 'bod' in c.lower()][0]
-            latest_value = df[bod_col].dropna().iloc[-1] if len(df) > 0 else 0
-            ComponentLibrary.kpi_card("Effluent BOD", f"{latest_value:.2f} mg/L", icon="💧")
+        if kpis['bod'] is not None:
+            ComponentLibrary.kpi_card("Effluent BOD", f"{kpis['bod']:.2f} mg/L", icon="💧")
         else:
             ComponentLibrary.kpi_card("Data Points", f"{len(df):,}", icon="📊")
     
     with col2:
-        if 'cod' in df.columns.str.lower().tolist():
-            cod_col = [c for c in df.columns if 'cod' in c.lower()][0]
-            latest_value = df[cod_col].dropna().iloc[-1] if len(df) > 0 else 0
-            ComponentLibrary.kpi_card("Effluent COD", f"{latest_value:.2f} mg/L", icon="🔬")
+        if kpis['cod'] is not None:
+            ComponentLibrary.kpi_card("Effluent COD", f"{kpis['cod']:.2f} mg/L", icon="🔬")
         else:
             ComponentLibrary.kpi_card("Columns", f"{len(df.columns)}", icon="📋")
     
     with col3:
-        if len(numeric_cols) > 0:
-            avg_value = df[numeric_cols[0]].mean()
-            ComponentLibrary.kpi_card("Average Value", f"{avg_value:.2f}", icon="📈")
+        if kpis['avg'] is not None:
+            ComponentLibrary.kpi_card("Average Value", f"{kpis['avg']:.2f}", icon="📈")
         else:
-            ComponentLibrary.kpi_card("Sites", f"{df['site_id'].nunique() if 'site_id' in df.columns else 'N/A'}", icon="🏭")
+            ComponentLibrary.kpi_card("Sites", f"{kpis['sites'] if kpis['sites'] is not None else 'N/A'}", icon="🏭")
     
     with col4:
-        date_cols = [c for c in df.columns if 'date' in c.lower()]
-        if date_cols:
-            date_col = date_cols[0]
-            if pd.api.types.is_datetime64_any_dtype(df[date_col]):
-                date_range = (df[date_col].max() - df[date_col].min()).days
-                ComponentLibrary.kpi_card("Date Range", f"{date_range} days", icon="📅")
-            else:
-                ComponentLibrary.kpi_card("Records", f"{len(df):,}", icon="📝")
+        if kpis['date_range_days'] is not None:
+            ComponentLibrary.kpi_card("Date Range", f"{kpis['date_range_days']} days", icon="📅")
         else:
             ComponentLibrary.kpi_card("Records", f"{len(df):,}", icon="📝")
     
@@ -70,33 +149,35 @@ def render():
         selected_col = st.selectbox("Select metric", numeric_cols[:5], key="dashboard_metric")
         
         # Get date column for x-axis
-        date_cols = [c for c in df.columns if 'date' in c.lower()]
-        x_col = date_cols[0] if date_cols else df.index
+        date_col = kpis['date_col']
         
-        if date_cols:
-            df_plot = df[[date_cols[0], selected_col]].dropna().copy()
-            x_vals = df_plot[date_cols[0]]
+        if date_col:
+            df_plot = df[[date_col, selected_col]].dropna()
+            x_vals = df_plot[date_col].to_numpy()
         else:
-            df_plot = df[[selected_col]].dropna().copy()
-            x_vals = df_plot.index
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=x_vals,
-            y=df_plot[selected_col],
-            mode='lines+markers',
-            name=selected_col,
-            line=dict(color='#1f77b4', width=2),
-        ))
+            df_plot = df[[selected_col]].dropna()
+            x_vals = df_plot.index.to_numpy()
+        x_vals, y_vals = _downsample(x_vals, df_plot[selected_col].to_numpy())
         
-        fig.update_layout(
-            height=400,
-            hovermode='x unified',
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            margin=dict(l=0, r=0, t=20, b=0),
-            xaxis_title=date_cols[0] if date_cols else "Index",
-            yaxis_title=selected_col,
+        # One constructor call validates the trace and layout together
+        fig = go.Figure(
+            data=[dict(
+                type='scatter',
+                x=x_vals,
+                y=y_vals,
+                mode='lines+markers',
+                name=selected_col,
+                line=dict(color='#1f77b4', width=2),
+            )],
+            layout=dict(
+                height=400,
+                hovermode='x unified',
+                plot_bgcolor='white',
+                paper_bgcolor='white',
+                margin=dict(l=0, r=0, t=20, b=0),
+                xaxis=dict(title=date_col if date_col else "Index"),
+                yaxis=dict(title=selected_col),
+            ),
         )
         
         st.plotly_chart(fig, use_container_width=True)
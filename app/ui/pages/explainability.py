@@ -1,5 +1,6 @@
 """Explainability Lab page."""
 
+from typing import Any, Dict, Optional
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -12,6 +13,72 @@ except ImportError:
 from app.ui.components.library import ComponentLibrary
 from app.ui.state.manager import StateManager
 
+# Points per axis of the what-if prediction surface
+WHATIF_GRID_SIZE = 25
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _shap_explanation(
+    model_id: int,
+    dataset_key: Optional[str],
+    _model: Any,
+    _sample_data: pd.DataFrame,
+) -> Dict[str, Any]:
+    """Run TreeSHAP and predict over the whole sample once per model and dataset.
+    
+    Slider moves on the page then only index the cached arrays.
+    
+    Args:
+        model_id: ``id()`` of the model; part of the cache key. The entry keeps
+            a reference to the model, so the id cannot be reused while cached
+        dataset_key: ``StateManager.get_dataset_key()``; part of the cache key
+        _model: Trained model (not hashed)
+        _sample_data: Rows to explain (not hashed)
+        
+    Returns:
+        Dictionary with 'model', 'explainer' (None when the model computes
+        its own contributions), 'shap_values' and 'predictions'
+    """
+    if hasattr(_model, 'predict_contrib'):
+        # LightGBM computes TreeSHAP natively in C++; drop the bias column
+        explainer = None
+        shap_values = _model.predict_contrib(_sample_data)[:, :-1]
+    else:
+        explainer = shap.TreeExplainer(_model.model if hasattr(_model, 'model') else _model)
+        shap_values = explainer.shap_values(_sample_data)
+    return {
+        'model': _model,
+        'explainer': explainer,
+        'shap_values': shap_values,
+        'predictions': np.asarray(_model.predict(_sample_data)),
+    }
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _top_feature_importance(model_id: int, _model: Any, k: int = 10) -> Dict[str, Any]:
+    """Extract and rank a model's feature importances once per model.
+    
+    Args:
+        model_id: ``id()`` of the model; the cache key. The entry keeps a
+            reference to the model, so the id cannot be reused while cached
+        _model: Trained model (not hashed)
+        k: Number of top features to keep
+        
+    Returns:
+        Dictionary with 'model' and 'top_features', a list of
+        ``(feature, importance)`` pairs sorted by descending importance
+    """
+    if hasattr(_model, 'get_feature_importance'):
+        importances = _model.get_feature_importance()
+    elif hasattr(_model, 'feature_importances_'):
+        importances = dict(zip(_model.feature_names_in_ if hasattr(_model, 'feature_names_in_') else range(len(_model.feature_importances_)), _model.feature_importances_))
+    else:
+        importances = {}
+    return {
+        'model': _model,
+        'top_features': sorted(importances.items(), key=lambda x: x[1], reverse=True)[:k],
+    }
+
 
 def render():
     """Render the Explainability Lab page."""
@@ -44,18 +111,10 @@ def render():
     
     st.markdown("### 📊 Global Feature Importance")
     
-    # Get feature importance
-    if hasattr(model, 'get_feature_importance'):
-        importances = model.get_feature_importance()
-    elif hasattr(model, 'feature_importances_'):
-        importances = dict(zip(model.feature_names_in_ if hasattr(model, 'feature_names_in_') else range(len(model.feature_importances_)), model.feature_importances_))
-    else:
-        importances = {}
+    # Get feature importance (extracted and sorted once per model)
+    sorted_features = _top_feature_importance(id(model), model)['top_features']
     
-    if importances:
-        # Sort by importance
-        sorted_features = sorted(importances.items(), key=lambda x: x[1], reverse=True)[:10]
-        
+    if sorted_features:
         fig = go.Figure()
         fig.add_trace(go.Bar(
             x=[v for _, v in sorted_features],
@@ -78,13 +137,13 @@ def render():
         
         try:
             # Prepare data for SHAP
-            numeric_cols = df.select_dtypes(include=['number']).columns.tolist()[:10]
+            numeric_cols = StateManager.get_numeric_cols()[:10]
             sample_data = df[numeric_cols].dropna().head(100)
             
             if len(sample_data) > 0 and hasattr(model, 'predict'):
                 with st.spinner("Computing SHAP values..."):
-                    explainer = shap.TreeExplainer(model.model if hasattr(model, 'model') else model)
-                    shap_values = explainer.shap_values(sample_data)
+                    explanation = _shap_explanation(id(model), StateManager.get_dataset_key(), model, sample_data)
+                    shap_values = explanation['shap_values']
                     
                     # Summary plot
                     st.markdown("#### Summary Plot")
@@ -100,31 +159,33 @@ def render():
                     else:
                         shap_values_single = shap_values[instance_idx]
                     
-                    st.info(f"Instance {instance_idx}: Prediction = {model.predict(sample_data.iloc[[instance_idx]])[0]:.2f}")
+                    st.info(f"Instance {instance_idx}: Prediction = {explanation['predictions'][instance_idx]:.2f}")
         except Exception as e:
             st.warning(f"SHAP analysis unavailable: {str(e)}")
     
     # Partial Dependence (simplified)
     st.markdown("### 📈 Partial Dependence Analysis")
     
-    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+    numeric_cols = StateManager.get_numeric_cols()
     if len(numeric_cols) > 0:
         feature_for_pdp = st.selectbox("Feature for PDP", numeric_cols[:5])
         
         if st.button("📊 Generate PDP"):
             with st.spinner("Computing partial dependence..."):
-                # Simple PDP approximation
-                feature_values = df[feature_for_pdp].dropna().values
-                unique_vals = np.linspace(feature_values.min(), feature_values.max(), 20)
+                # Simple PDP approximation; the grid spans the cached column
+                # range rather than a dropna() copy of the feature
+                feature_stats = StateManager.get_column_stats()[feature_for_pdp]
+                unique_vals = np.linspace(feature_stats['min'], feature_stats['max'], 20)
                 
-                # For demo: approximate PDP
-                pdp_values = []
-                for val in unique_vals:
-                    temp_df = df.copy()
-                    temp_df[feature_for_pdp] = val
-                    if hasattr(model, 'predict'):
-                        predictions = model.predict(temp_df[numeric_cols[:10]].fillna(0).head(10))
-                        pdp_values.append(np.mean(predictions))
+                # For demo: approximate PDP over the first 10 rows. Every grid
+                # value gets its own copy of those rows, stacked into one
+                # frame so the model is called once instead of per value.
+                feature_cols = numeric_cols[:10]
+                base = df[feature_cols].head(10).fillna(0).to_numpy(dtype=np.float64)
+                X = np.tile(base, (len(unique_vals), 1))
+                X[:, feature_cols.index(feature_for_pdp)] = np.repeat(unique_vals, len(base))
+                predictions = np.asarray(model.predict(pd.DataFrame(X, columns=feature_cols)))
+                pdp_values = predictions.reshape(len(unique_vals), len(base)).mean(axis=1)
                 
                 fig = go.Figure()
                 fig.add_trace(go.Scatter(
@@ -146,37 +207,73 @@ def render():
     # What-if analysis
     st.markdown("### 🔮 What-If Analysis")
     
+    # Slider bounds come from per-dataset cached column stats
+    column_stats = StateManager.get_column_stats()
+    
     col1, col2 = st.columns(2)
     with col1:
         feature1 = st.selectbox("Feature 1", numeric_cols[:5] if len(numeric_cols) > 0 else [])
         value1 = st.slider(f"{feature1} value", 
-                          float(df[feature1].min()) if len(numeric_cols) > 0 else 0.0,
-                          float(df[feature1].max()) if len(numeric_cols) > 0 else 100.0,
-                          float(df[feature1].mean()) if len(numeric_cols) > 0 else 50.0,
+                          column_stats[feature1]['min'] if len(numeric_cols) > 0 else 0.0,
+                          column_stats[feature1]['max'] if len(numeric_cols) > 0 else 100.0,
+                          column_stats[feature1]['mean'] if len(numeric_cols) > 0 else 50.0,
                           key="whatif_feature1_slider")
     
     with col2:
         feature2 = st.selectbox("Feature 2", numeric_cols[:5] if len(numeric_cols) > 1 else [])
         if len(numeric_cols) > 1:
             value2 = st.slider(f"{feature2} value",
-                              float(df[feature2].min()),
-                              float(df[feature2].max()),
-                              float(df[feature2].mean()),
+                              column_stats[feature2]['min'],
+                              column_stats[feature2]['max'],
+                              column_stats[feature2]['mean'],
                               key="whatif_feature2_slider")
         else:
             value2 = 0.0
     
     if st.button("🔍 Predict with What-If Values"):
         try:
-            # Create input with what-if values
-            instance = df[numeric_cols[:10]].iloc[0].copy() if len(df) > 0 else pd.Series([0]*min(10, len(numeric_cols)))
-            if feature1 in instance.index:
-                instance[feature1] = value1
-            if feature2 in instance.index and len(numeric_cols) > 1:
-                instance[feature2] = value2
+            # Create input with what-if values: read only the first row of the
+            # feature columns into a small float array and edit it in place
+            cols = numeric_cols[:10]
+            row = df.iloc[:1][cols].to_numpy(dtype=np.float64).reshape(-1) if len(df) > 0 else np.zeros(len(cols))
+            row[np.isnan(row)] = 0.0
+            if feature1 in cols:
+                row[cols.index(feature1)] = value1
+            if feature2 in cols and len(numeric_cols) > 1:
+                row[cols.index(feature2)] = value2
             
-            prediction = model.predict(pd.DataFrame([instance]).fillna(0))
+            prediction = model.predict(pd.DataFrame(row.reshape(1, -1), columns=cols))
             st.success(f"Predicted value: **{prediction[0]:.2f}**")
         except Exception as e:
             st.error(f"Prediction failed: {str(e)}")
+    
+    if len(numeric_cols) > 1 and feature1 != feature2 and st.button("🗺️ Show What-If Surface"):
+        try:
+            # Sweep both features over their ranges with the other features
+            # held at the first row; every grid point goes into one predict
+            cols = numeric_cols[:10]
+            if feature1 not in cols or feature2 not in cols:
+                raise ValueError("Both features must be among the model's first 10 numeric columns")
+            row = df.iloc[:1][cols].to_numpy(dtype=np.float64).reshape(-1) if len(df) > 0 else np.zeros(len(cols))
+            row[np.isnan(row)] = 0.0
+            grid1 = np.linspace(column_stats[feature1]['min'], column_stats[feature1]['max'], WHATIF_GRID_SIZE)
+            grid2 = np.linspace(column_stats[feature2]['min'], column_stats[feature2]['max'], WHATIF_GRID_SIZE)
+            values1, values2 = np.meshgrid(grid1, grid2)
+            X = np.tile(row, (values1.size, 1))
+            X[:, cols.index(feature1)] = values1.ravel()
+            X[:, cols.index(feature2)] = values2.ravel()
+            surface = np.asarray(model.predict(pd.DataFrame(X, columns=cols))).reshape(values1.shape)
+            
+            fig = go.Figure(
+                data=[dict(type='heatmap', x=grid1, y=grid2, z=surface, colorscale='Viridis')],
+                layout=dict(
+                    title=f"Predicted value over {feature1} × {feature2}",
+                    xaxis=dict(title=feature1),
+                    yaxis=dict(title=feature2),
+                    height=500,
+                ),
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        except Exception as e:
+            st.error(f"Prediction failed: {str(e)}")
 
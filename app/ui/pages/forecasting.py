@@ -1,5 +1,6 @@
 """Forecasting Hub page."""
 
+from typing import Dict, Optional, Tuple
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -7,8 +8,74 @@ import plotly.graph_objects as go
 from app.ui.components.library import ComponentLibrary
 from app.ui.state.manager import StateManager
 from app.ai.pipeline.serving import ServingLayer
-from app.ai.pipeline.ingestion import DataIngestionEngine
-from app.ai.pipeline.features import FeatureFactory
+from app.ai.pipeline.features import FeatureFactory, FeatureSet
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _build_forecast_features(
+    dataset_key: Optional[str],
+    target_col: str,
+    date_col: Optional[str],
+    site_col: Optional[str],
+    model_hint: Optional[str],
+    _df: pd.DataFrame,
+) -> FeatureSet:
+    """Engineer forecasting features once per dataset and column selection.
+    
+    Args:
+        dataset_key: ``StateManager.get_dataset_key()``; part of the cache key
+        target_col: Target column
+        date_col: Date column
+        site_col: Site column
+        model_hint: Passed through to ``FeatureFactory.build``
+        _df: Dataset (not hashed)
+        
+    Returns:
+        FeatureSet built on all rows (no validation/test split)
+    """
+    return FeatureFactory(max_lags=7).build(
+        _df,
+        target_col=target_col,
+        date_col=date_col,
+        site_col=site_col,
+        test_size=0.0,  # Use all data for forecasting
+        val_size=0.0,
+        model_hint=model_hint,
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _forecast_dates(n_hist: int, horizon: int, anchor: str) -> Tuple[pd.DatetimeIndex, pd.DatetimeIndex, pd.DatetimeIndex]:
+    """Daily x-axes for the forecast chart, reused across scenario reruns.
+    
+    Args:
+        n_hist: Number of historical points
+        horizon: Forecast horizon in days
+        anchor: ISO timestamp of the last historical point (stored when the
+            forecast is generated)
+        
+    Returns:
+        Tuple of (historical dates, forecast dates, closed band outline of
+        the forecast dates followed by the same dates reversed)
+    """
+    hist_dates = pd.date_range(end=pd.Timestamp(anchor), periods=n_hist, freq='D')
+    forecast_dates = pd.date_range(start=hist_dates[-1] + pd.Timedelta(days=1), periods=horizon, freq='D')
+    return hist_dates, forecast_dates, forecast_dates.append(forecast_dates[::-1])
+
+
+def _extrapolate(start: float, trend: float, horizon: int) -> np.ndarray:
+    """Linear extrapolation ``start + trend * step`` for steps 1..horizon."""
+    return start + trend * np.arange(1, horizon + 1, dtype=np.float64)
+
+
+def _with_interval(forecast: np.ndarray, std: float) -> Dict[str, np.ndarray]:
+    """Wrap a point forecast with a +/-1.96 std band."""
+    offset = 1.96 * std
+    return {
+        'forecast': forecast,
+        'lower': forecast - offset,
+        'upper': forecast + offset,
+    }
 
 
 def render():
@@ -60,7 +127,7 @@ def render():
     
     with col2:
         # Target selection
-        numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+        numeric_cols = StateManager.get_numeric_cols()
         target_col = st.selectbox("Target Variable", numeric_cols[:10])
     
     # Generate forecast
@@ -71,13 +138,18 @@ def render():
                 training_metadata = st.session_state.get('training_metadata', {})
                 
                 # Get date and site columns from metadata or auto-detect
-                ingestion = DataIngestionEngine()
-                schema = ingestion.detect_schema(df)
+                schema = StateManager.get_schema()
                 date_col = training_metadata.get('date_col') or schema.get('date_column')
                 site_col = training_metadata.get('site_col') or schema.get('site_column')
                 
                 serving = ServingLayer()
                 
+                # Non-null target values, extracted once and shared by every
+                # branch below (last value, trend window and interval width)
+                series = df[target_col].to_numpy(dtype=np.float64, na_value=np.nan)
+                observed = series[~np.isnan(series)]
+                last_values = observed[-30:] if len(df) > 30 else observed
+                
                 # Try Prophet first (works with raw time series data)
                 if hasattr(model, 'forecast') and hasattr(model, 'model') and hasattr(model, 'target_col'):
                     # Prophet model - use its forecast method
@@ -93,14 +165,15 @@ def render():
                         # Model was trained with features - need to engineer same features
                         try:
                             # Build features using same factory settings
-                            factory = FeatureFactory(max_lags=7)
-                            feature_set = factory.build(
+                            # (LightGBMRegressor is the model with native TreeSHAP)
+                            is_lightgbm = hasattr(model, 'predict_contrib')
+                            feature_set = _build_forecast_features(
+                                StateManager.get_dataset_key(),
+                                target_col,
+                                date_col,
+                                site_col,
+                                'lgb' if is_lightgbm else None,
                                 df,
-                                target_col=target_col,
-                                date_col=date_col,
-                                site_col=site_col,
-                                test_size=0.0,  # Use all data for forecasting
-                                val_size=0.0,
                             )
                             
                             # Get last row's features for prediction
@@ -114,74 +187,65 @@ def render():
                                     model_features = list(model.feature_names_in_)
                                 elif hasattr(model, 'model') and hasattr(model.model, 'feature_name_'):
                                     model_features = list(model.model.feature_name_)
+                                elif hasattr(model, 'model') and hasattr(model.model, 'feature_name'):
+                                    # Native LightGBM Booster
+                                    model_features = list(model.model.feature_name())
                                 
                                 if model_features:
                                     # Align features
                                     available_features = [f for f in model_features if f in last_features.columns]
                                     if available_features:
-                                        X_pred = last_features[available_features]
-                                        # Fill any missing with 0
-                                        for col in model_features:
-                                            if col not in X_pred.columns:
-                                                X_pred[col] = 0
-                                        X_pred = X_pred[model_features]  # Reorder to match training
+                                        # Reorder to match training, filling any missing with 0
+                                        X_pred = last_features.reindex(columns=model_features, fill_value=0)
                                         predictions = model.predict(X_pred)
                                         
                                         # Extrapolate for horizon
-                                        last_value = df[target_col].dropna().iloc[-1] if len(df) > 0 else predictions[0]
+                                        last_value = observed[-1] if len(df) > 0 else predictions[0]
                                         trend = (predictions[0] - last_value) if len(predictions) > 0 else 0
-                                        forecast = [predictions[0] + trend * (i+1) for i in range(horizon)]
+                                        forecast = _extrapolate(predictions[0], trend, horizon)
                                     else:
                                         raise ValueError("No matching features found")
                                 else:
                                     predictions = model.predict(last_features)
-                                    last_value = df[target_col].dropna().iloc[-1] if len(df) > 0 else predictions[0]
+                                    last_value = observed[-1] if len(df) > 0 else predictions[0]
                                     trend = (predictions[0] - last_value) if len(predictions) > 0 else 0
-                                    forecast = [predictions[0] + trend * (i+1) for i in range(horizon)]
+                                    forecast = _extrapolate(predictions[0], trend, horizon)
                             else:
                                 raise ValueError("Could not create features")
                             
-                            std = np.std(df[target_col].dropna().tail(30).values) if len(df) > 30 else df[target_col].std()
-                            forecast_result = {
-                                'forecast': np.array(forecast),
-                                'lower': np.array(forecast) - 1.96 * std,
-                                'upper': np.array(forecast) + 1.96 * std,
-                            }
+                            std = np.std(last_values) if len(df) > 30 else observed.std(ddof=1)
+                            forecast_result = _with_interval(forecast, std)
                         except Exception as feat_error:
                             # Fallback to simple extrapolation if feature engineering fails
                             st.warning(f"Feature engineering failed, using simple extrapolation: {str(feat_error)}")
-                            last_values = df[target_col].dropna().tail(30).values if len(df) > 30 else df[target_col].dropna().values
                             if len(last_values) > 1:
-                                trend = np.mean(np.diff(last_values))
-                                forecast = [last_values[-1] + trend * (i+1) for i in range(horizon)]
+                                trend = (last_values[-1] - last_values[0]) / (len(last_values) - 1)  # Mean step (telescoped diffs)
+                                forecast = _extrapolate(last_values[-1], trend, horizon)
                             else:
-                                forecast = [last_values[-1]] * horizon if len(last_values) > 0 else [0] * horizon
+                                forecast = _extrapolate(last_values[-1] if len(last_values) > 0 else 0.0, 0.0, horizon)
                             
                             std = np.std(last_values) if len(last_values) > 1 else abs(last_values[-1] * 0.1) if len(last_values) > 0 else 1.0
-                            forecast_result = {
-                                'forecast': np.array(forecast),
-                                'lower': np.array(forecast) - 1.96 * std,
-                                'upper': np.array(forecast) + 1.96 * std,
-                            }
+                            forecast_result = _with_interval(forecast, std)
                     else:
                         # No feature engineering metadata - use simple extrapolation
-                        last_values = df[target_col].dropna().tail(30).values if len(df) > 30 else df[target_col].dropna().values
                         if len(last_values) > 1:
-                            trend = np.mean(np.diff(last_values))
-                            forecast = [last_values[-1] + trend * (i+1) for i in range(horizon)]
+                            trend = (last_values[-1] - last_values[0]) / (len(last_values) - 1)  # Mean step (telescoped diffs)
+                            forecast = _extrapolate(last_values[-1], trend, horizon)
                         else:
-                            forecast = [last_values[-1]] * horizon if len(last_values) > 0 else [0] * horizon
+                            forecast = _extrapolate(last_values[-1] if len(last_values) > 0 else 0.0, 0.0, horizon)
                         
                         std = np.std(last_values) if len(last_values) > 1 else abs(last_values[-1] * 0.1) if len(last_values) > 0 else 1.0
-                        forecast_result = {
-                            'forecast': np.array(forecast),
-                            'lower': np.array(forecast) - 1.96 * std,
-                            'upper': np.array(forecast) + 1.96 * std,
-                        }
+                        forecast_result = _with_interval(forecast, std)
                 
+                # Closed band outline (upper, then lower reversed), built once
+                # per forecast rather than on every scenario rerun
+                forecast_result['band'] = np.concatenate([forecast_result['upper'], forecast_result['lower'][::-1]])
                 st.session_state.forecast_result = forecast_result
                 st.session_state.forecast_horizon = horizon
                 st.session_state.forecast_target = target_col
+                st.session_state.forecast_anchor = pd.Timestamp.now().isoformat()
+                st.session_state.forecast_baseline_mean = float(np.mean(forecast_result['forecast']))
+                st.session_state.forecast_hist = observed[-100:]
                 st.success("✅ Forecast generated!")
             except Exception as e:
                 st.error(f"Forecast generation failed: {str(e)}")
@@ -196,49 +260,57 @@ def render():
         horizon = st.session_state.forecast_horizon
         target_col = st.session_state.forecast_target
         
-        # Get historical data
-        hist_data = df[target_col].dropna().tail(100).values
-        hist_dates = pd.date_range(end=pd.Timestamp.now(), periods=len(hist_data), freq='D')
-        forecast_dates = pd.date_range(start=hist_dates[-1] + pd.Timedelta(days=1), periods=horizon, freq='D')
+        # Get historical data (kept from forecast generation; no dropna per rerun)
+        hist_data = st.session_state.get('forecast_hist')
+        if hist_data is None:
+            hist_data = df[target_col].dropna().tail(100).values
+        anchor = st.session_state.get('forecast_anchor') or pd.Timestamp.now().isoformat()
+        hist_dates, forecast_dates, band_dates = _forecast_dates(len(hist_data), horizon, anchor)
         
         # Create plot
-        fig = go.Figure()
-        
         # Historical data
-        fig.add_trace(go.Scatter(
+        hist_trace = dict(
+            type='scatter',
             x=hist_dates,
             y=hist_data,
             mode='lines',
             name='Historical',
             line=dict(color='#1f77b4', width=2),
-        ))
+        )
         
         # Forecast
-        fig.add_trace(go.Scatter(
+        forecast_trace = dict(
+            type='scatter',
             x=forecast_dates,
             y=forecast_result['forecast'],
             mode='lines',
             name='Forecast',
             line=dict(color='#2ca07c', width=2, dash='dash'),
-        ))
+        )
         
         # Confidence intervals
-        fig.add_trace(go.Scatter(
-            x=forecast_dates.tolist() + forecast_dates.tolist()[::-1],
-            y=list(forecast_result['upper']) + list(forecast_result['lower'])[::-1],
+        band_trace = dict(
+            type='scatter',
+            x=band_dates,
+            y=forecast_result['band'],
             fill='tonexty',
             fillcolor='rgba(44, 160, 124, 0.2)',
             line=dict(color='rgba(255,255,255,0)'),
             name=f'{int(confidence*100)}% Confidence',
             showlegend=True,
-        ))
+        )
         
-        fig.update_layout(
-            title=f"{target_col} Forecast ({horizon} days)",
-            xaxis_title="Date",
-            yaxis_title=target_col,
-            height=500,
-            hovermode='x unified',
+        # One validated constructor call per rerun instead of add_trace per
+        # trace plus update_layout
+        fig = go.Figure(
+            data=[hist_trace, forecast_trace, band_trace],
+            layout=dict(
+                title=f"{target_col} Forecast ({horizon} days)",
+                xaxis=dict(title="Date"),
+                yaxis=dict(title=target_col),
+                height=500,
+                hovermode='x unified',
+            ),
         )
         
         st.plotly_chart(fig, use_container_width=True)
@@ -256,10 +328,15 @@ def render():
         
         if st.button("🔄 Update Forecast with Scenarios"):
             # Adjust forecast based on scenarios
-            adjusted_forecast = forecast_result['forecast'] * (1 + flow_change/100) * (1 + temp_change/100) * (1 + aeration_change/100)
+            # The adjustments are scalar factors, so the adjusted mean is the
+            # baseline mean times their product (no adjusted array needed)
+            factor = (1 + flow_change/100) * (1 + temp_change/100) * (1 + aeration_change/100)
+            baseline_mean = st.session_state.get('forecast_baseline_mean')
+            if baseline_mean is None:
+                baseline_mean = float(np.mean(forecast_result['forecast']))
             
-            st.info(f"Scenario-adjusted forecast: Mean = {np.mean(adjusted_forecast):.2f} "
-                   f"(vs baseline {np.mean(forecast_result['forecast']):.2f})")
+            st.info(f"Scenario-adjusted forecast: Mean = {baseline_mean * factor:.2f} "
+                   f"(vs baseline {baseline_mean:.2f})")
 
 
 
@@ -23,7 +23,7 @@ def render():
         author = st.text_input("Author", "Analytics Team")
     
     with col2:
-        output_format = st.selectbox("Output Format", ["PDF", "PPTX", "HTML"])
+        output_format = st.selectbox("Output Format", ["PDF", "PPTX", "HTML", "All Formats"])
         include_charts = st.checkbox("Include Charts", True)
         include_raw_data = st.checkbox("Include Raw Data Tables", False)
     
@@ -33,10 +33,10 @@ def render():
     sections = {
         'Executive Summary': st.checkbox("Executive Summary", True),
         'KPIs': st.checkbox("Key Performance Indicators", True),
-        'Forecasting Analysis': st.checkbox("Forecasting Analysis", StateManager.get_all_models() != {}),
+        'Forecasting Analysis': st.checkbox("Forecasting Analysis", StateManager.has_models()),
         'Anomaly Detection': st.checkbox("Anomaly Detection Results", 'anomaly_results' in st.session_state),
         'Benchmarking': st.checkbox("Benchmarking Analysis", 'benchmark_results' in st.session_state),
-        'Explainability': st.checkbox("Model Explainability", StateManager.get_all_models() != {}),
+        'Explainability': st.checkbox("Model Explainability", StateManager.has_models()),
     }
     
     # Generate report
@@ -59,25 +59,23 @@ def render():
                     'include_raw_data': include_raw_data,
                 }
                 
-                if output_format == "PDF":
-                    report_path = exporter.generate_pdf_report(df, metadata)
-                elif output_format == "PPTX":
-                    report_path = exporter.generate_pptx_report(df, metadata)
-                else:
-                    report_path = exporter.generate_html_report(df, metadata)
+                formats = ('pdf', 'pptx', 'html') if output_format == "All Formats" else (output_format.lower(),)
+                report_paths = exporter.generate_all(df, metadata, formats=formats)
                 
                 st.success(f"✅ Report generated successfully!")
-                st.info(f"📁 Report saved to: `{report_path}`")
                 
-                # Download button
-                with open(report_path, 'rb') as f:
-                    file_ext = output_format.lower()
-                    st.download_button(
-                        label=f"📥 Download {output_format} Report",
-                        data=f.read(),
-                        file_name=f"wastewater_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_ext}",
-                        mime=f"application/{file_ext}" if file_ext != "html" else "text/html",
-                    )
+                for file_ext, report_path in report_paths.items():
+                    st.info(f"📁 Report saved to: `{report_path}`")
+                    
+                    # Download button
+                    with open(report_path, 'rb') as f:
+                        st.download_button(
+                            label=f"📥 Download {file_ext.upper()} Report",
+                            data=f.read(),
+                            file_name=Path(report_path).name,
+                            mime=f"application/{file_ext}" if file_ext != "html" else "text/html",
+                            key=f"download_{file_ext}",
+                        )
                 
             except Exception as e:
                 st.error(f"Report generation failed: {str(e)}")
@@ -1,5 +1,7 @@
 """AI Training Studio page."""
 
+from dataclasses import replace
+from typing import Any, Dict, Optional
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
@@ -11,6 +13,25 @@ from app.ai.pipeline.orchestrator import ModelOrchestrator
 from app.ai.pipeline.serving import ServingLayer
 
 
+@st.cache_data(show_spinner=False, max_entries=4)
+def _data_quality_stats(
+    dataset_key: Optional[str],
+    _df: pd.DataFrame,
+    _schema: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Validate the dataset once per load rather than on every widget change.
+    
+    Args:
+        dataset_key: ``StateManager.get_dataset_key()``; the cache key
+        _df: Dataset (the leading underscore keeps Streamlit from hashing it)
+        _schema: ``StateManager.get_schema()`` for the same dataset (not hashed)
+        
+    Returns:
+        Validation stats from ``DataIngestionEngine.validate_data``
+    """
+    return DataIngestionEngine().validate_data(_df, schema=_schema)
+
+
 def render():
     """Render the AI Training Studio page."""
     ComponentLibrary.section_header("🤖 AI Training Studio")
@@ -22,28 +43,28 @@ def render():
     
     with upload_tab:
         uploaded_file = st.file_uploader(
-            "Upload wastewater dataset (CSV, Excel, Parquet)",
-            type=['csv', 'xlsx', 'xls', 'parquet'],
+            "Upload wastewater dataset (CSV, Excel, Parquet, Feather)",
+            type=['csv', 'xlsx', 'xls', 'parquet', 'feather'],
             help="Upload a dataset with date, site, and target columns",
         )
         
         if uploaded_file is not None:
             try:
-                ingestion = DataIngestionEngine()
-                # Save temporarily
-                temp_path = Path("app/data/raw/temp_upload.csv")
-                temp_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(temp_path, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
-                
-                df = ingestion.load_from_path(str(temp_path))
-                StateManager.set_dataset(df, str(temp_path))
-                st.success(f"✅ Dataset loaded: {len(df)} rows, {len(df.columns)} columns")
+                # The uploader keeps its file across reruns; parse it straight
+                # from memory, and only when a different file is uploaded
+                upload_id = (uploaded_file.name, uploaded_file.size, getattr(uploaded_file, 'file_id', None))
+                if st.session_state.get('_upload_id') != upload_id:
+                    ingestion = DataIngestionEngine()
+                    df = ingestion.load_from_buffer(uploaded_file, Path(uploaded_file.name).suffix)
+                    StateManager.set_dataset(df, uploaded_file.name)
+                    st.session_state._upload_id = upload_id
+                    st.success(f"✅ Dataset loaded: {len(df)} rows, {len(df.columns)} columns")
             except Exception as e:
                 st.error(f"Error loading file: {str(e)}")
     
     with select_tab:
-        sample_files = list(Path("app/data/raw").glob("*.csv"))
+        raw_dir = Path("app/data/raw")
+        sample_files = list(raw_dir.glob("*.csv")) + list(raw_dir.glob("*.parquet"))
         if sample_files:
             selected_file = st.selectbox(
                 "Select sample dataset",
@@ -67,12 +88,11 @@ def render():
         st.markdown("### 📊 Dataset Overview")
         
         # Data quality dashboard
-        ingestion = DataIngestionEngine()
-        stats = ingestion.validate_data(df)
+        stats = _data_quality_stats(StateManager.get_dataset_key(), df, StateManager.get_schema())
         ComponentLibrary.data_quality_card(stats)
         
         # Schema detection
-        schema = ingestion.detect_schema(df)
+        schema = StateManager.get_schema()
         
         col1, col2 = st.columns(2)
         with col1:
@@ -152,6 +172,8 @@ def render():
                             date_col=date_col,
                             site_col=site_col,
                             horizon=horizon,
+                            # The data quality card above already summarizes the frame
+                            validate=False,
                         )
                         
                         progress_bar.progress(80)
@@ -159,6 +181,7 @@ def render():
                         
                         # Save models
                         serving = ServingLayer()
+                        saved_paths = {}
                         for model_name, model in result.models.items():
                             if model is not None:
                                 metadata = {
@@ -168,11 +191,18 @@ def render():
                                     'metrics': result.metrics.get(model_name, {}),
                                     'feature_names': result.feature_names,  # Store feature names
                                 }
-                                serving.save_model(model, f"{model_name}_{target_col}", metadata)
-                                StateManager.set_model(model_name, model)
+                                saved_paths[model_name] = serving.save_model(model, f"{model_name}_{target_col}", metadata)
+                                # Session state keeps only the artifact path
+                                StateManager.set_model(model_name, model, path=saved_paths[model_name])
                         
-                        StateManager.set_model("best", result.models.get(result.best_model_key))
-                        st.session_state.training_result = result
+                        StateManager.set_model(
+                            "best",
+                            result.models.get(result.best_model_key),
+                            path=saved_paths.get(result.best_model_key),
+                        )
+                        # The results table only needs the metrics; the models
+                        # themselves are reloaded from the registry on demand
+                        st.session_state.training_result = replace(result, models={})
                         
                         # Store training metadata for forecasting
                         st.session_state.training_metadata = {
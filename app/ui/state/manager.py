@@ -1,9 +1,12 @@
 """State manager for Streamlit session state."""
 
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List
+from uuid import uuid4
 import streamlit as st
 import pandas as pd
 from pathlib import Path
+from app.ai.pipeline.ingestion import DataIngestionEngine
+from app.ai.pipeline.serving import ServingLayer
 
 
 class StateManager:
@@ -15,7 +18,12 @@ class StateManager:
         defaults = {
             "current_dataset": None,
             "dataset_path": None,
+            "dataset_key": None,
+            "numeric_cols": None,
+            "dataset_schema": None,
+            "column_stats": None,
             "trained_models": {},
+            "model_paths": {},
             "selected_model": None,
             "forecast_results": None,
             "anomaly_results": None,
@@ -23,9 +31,10 @@ class StateManager:
             "explanation_data": None,
         }
         
-        for key, value in defaults.items():
-            if key not in st.session_state:
-                st.session_state[key] = value
+        # One update with only the missing keys (existing values are kept)
+        missing = {key: value for key, value in defaults.items() if key not in st.session_state}
+        if missing:
+            st.session_state.update(missing)
     
     @staticmethod
     def set_dataset(df: pd.DataFrame, path: Optional[str] = None) -> None:
@@ -37,6 +46,10 @@ class StateManager:
         """
         st.session_state.current_dataset = df
         st.session_state.dataset_path = path
+        st.session_state.dataset_key = uuid4().hex
+        st.session_state.numeric_cols = None
+        st.session_state.dataset_schema = None
+        st.session_state.column_stats = None
     
     @staticmethod
     def get_dataset() -> Optional[pd.DataFrame]:
@@ -44,32 +57,115 @@ class StateManager:
         return st.session_state.get("current_dataset")
     
     @staticmethod
-    def set_model(name: str, model: Any) -> None:
+    def get_numeric_cols() -> List[str]:
+        """Get the numeric column names of the current dataset.
+        
+        Computed once per dataset (``set_dataset`` resets it) instead of by
+        every page on every rerun.
+        """
+        cols = st.session_state.get("numeric_cols")
+        if cols is None:
+            df = StateManager.get_dataset()
+            if df is None:
+                return []
+            cols = df.select_dtypes(include=['number']).columns.tolist()
+            st.session_state.numeric_cols = cols
+        return list(cols)
+    
+    @staticmethod
+    def get_column_stats() -> Dict[str, Dict[str, float]]:
+        """Get min/max/mean of every numeric column of the current dataset.
+        
+        Computed with one ``agg`` per dataset (``set_dataset`` resets it), so
+        widgets bounded by column ranges do not rescan columns on reruns.
+        
+        Returns:
+            Dictionary mapping column name to {'min', 'max', 'mean'}
+        """
+        stats = st.session_state.get("column_stats")
+        if stats is None:
+            df = StateManager.get_dataset()
+            if df is None:
+                return {}
+            numeric_cols = StateManager.get_numeric_cols()
+            stats = df[numeric_cols].agg(['min', 'max', 'mean']).astype(float).to_dict()
+            st.session_state.column_stats = stats
+        return stats
+    
+    @staticmethod
+    def get_schema() -> Optional[Dict[str, Any]]:
+        """Get ``DataIngestionEngine.detect_schema`` output for the current dataset.
+        
+        Detected once per dataset (``set_dataset`` resets it) instead of on
+        every rerun. Treat the returned dictionary as read-only.
+        """
+        schema = st.session_state.get("dataset_schema")
+        if schema is None:
+            df = StateManager.get_dataset()
+            if df is None:
+                return None
+            schema = DataIngestionEngine().detect_schema(df)
+            st.session_state.dataset_schema = schema
+        return schema
+    
+    @staticmethod
+    def get_dataset_key() -> Optional[str]:
+        """Get a token that changes whenever a new dataset is stored.
+        
+        Use it as the cache key for ``st.cache_data`` helpers that take the
+        dataset, instead of hashing the DataFrame on every rerun.
+        """
+        return st.session_state.get("dataset_key")
+    
+    @staticmethod
+    def set_model(name: str, model: Any, path: Optional[str] = None) -> None:
         """Store a trained model.
         
         Args:
             name: Model name/identifier
             model: Model object to store
+            path: Registry artifact the model was saved to. When given, only
+                the path is kept in session state and the model is loaded
+                (once per process, shared across sessions) on access.
         """
         if "trained_models" not in st.session_state:
             st.session_state.trained_models = {}
-        st.session_state.trained_models[name] = model
+        if "model_paths" not in st.session_state:
+            st.session_state.model_paths = {}
+        
+        if path:
+            st.session_state.model_paths[name] = path
+            st.session_state.trained_models.pop(name, None)
+        else:
+            st.session_state.trained_models[name] = model
+            st.session_state.model_paths.pop(name, None)
     
     @staticmethod
     def get_model(name: str) -> Optional[Any]:
         """Get a stored model."""
+        path = st.session_state.get("model_paths", {}).get(name)
+        if path:
+            return ServingLayer.load_model_file(path)
         return st.session_state.get("trained_models", {}).get(name)
     
+    @staticmethod
+    def has_models() -> bool:
+        """Check whether any model is stored, without loading saved ones."""
+        return bool(st.session_state.get("trained_models")) or bool(st.session_state.get("model_paths"))
+    
     @staticmethod
     def get_all_models() -> Dict[str, Any]:
         """Get all stored models."""
-        return st.session_state.get("trained_models", {})
+        names = dict.fromkeys([
+            *st.session_state.get("trained_models", {}),
+            *st.session_state.get("model_paths", {}),
+        ])
+        return {name: StateManager.get_model(name) for name in names}
     
     @staticmethod
     def clear_state() -> None:
         """Clear all session state."""
-        for key in list(st.session_state.keys()):
-            del st.session_state[key]
+        st.session_state.clear()
         StateManager.init_session_state()
 
 
@@ -1,10 +1,18 @@
 """Theme manager for Aqua Analytics design system."""
 
+import re
 from pathlib import Path
-from typing import Dict, Any
+from string import Template
+from typing import Any, Dict, Optional, Tuple
 import streamlit as st
 import yaml
 
+# Optional import: the LibYAML-backed loader parses several times faster
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
 # Aqua Analytics color palette
 AQUA_COLORS = {
@@ -17,171 +25,239 @@ AQUA_COLORS = {
 }
 
 
-class ThemeManager:
-    """Manages theme injection and design system constants."""
-    
-    def __init__(self):
-        """Initialize theme manager with config."""
-        self.config = self._load_config()
-        self.colors = self.config.get("theme", {}).get("colors", AQUA_COLORS)
+# Settings file read by ThemeManager
+SETTINGS_PATH = Path("config/settings.yaml")
+
+
+@st.cache_data(show_spinner=False)
+def _load_settings(path_str: str, mtime: float) -> Dict[str, Any]:
+    """Parse the settings YAML once per file version.
     
-    def _load_config(self) -> Dict[str, Any]:
-        """Load settings from config file."""
-        try:
-            config_path = Path("config/settings.yaml")
-            if config_path.exists():
-                with open(config_path, "r") as f:
-                    return yaml.safe_load(f) or {}
-        except Exception:
-            pass
-        return {}
+    Args:
+        path_str: Path to the settings file
+        mtime: File modification time (only used as a cache key)
+        
+    Returns:
+        Parsed settings (empty if the file is empty)
+    """
+    with open(path_str, "r") as f:
+        return yaml.load(f, Loader=SafeLoader) or {}
+
+
+def _minify_css(css: str) -> str:
+    """Drop comments, indentation and blank lines from a stylesheet.
     
-    def inject_theme(self) -> None:
-        """Inject CSS theme into Streamlit app."""
-        css = f"""
+    ``st.markdown`` has to re-send the stylesheet on every rerun (Streamlit
+    removes elements a rerun does not emit), so this trims each delta.
+    """
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    return "\n".join(line.strip() for line in css.splitlines() if line.strip())
+
+
+# Theme stylesheet; only the $-placeholders vary with the palette
+_CSS_TEMPLATE = Template(_minify_css("""
         <style>
-        :root {{
-          --color-primary: {self.colors.get('primary', AQUA_COLORS['primary'])};
-          --color-teal: {self.colors.get('teal', AQUA_COLORS['teal'])};
-          --color-alert: {self.colors.get('alert', AQUA_COLORS['alert'])};
-          --bg: {self.colors.get('bg', AQUA_COLORS['bg'])};
-          --text: {self.colors.get('text', AQUA_COLORS['text'])};
-          --text-light: {self.colors.get('text_light', AQUA_COLORS['text_light'])};
-        }}
+        :root {
+          --color-primary: $primary;
+          --color-teal: $teal;
+          --color-alert: $alert;
+          --bg: $bg;
+          --text: $text;
+          --text-light: $text_light;
+        }
         
         /* Import fonts */
         @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&family=Fira+Mono:wght@400&display=swap');
         
         /* Base styling */
-        .main {{
+        .main {
           background-color: var(--bg);
           font-family: 'Inter', sans-serif;
-        }}
+        }
         
         /* Cards */
-        .aqua-card {{
+        .aqua-card {
           background: white;
           border-radius: 16px;
           padding: 20px;
           box-shadow: 0 4px 14px rgba(0,0,0,0.06);
           margin-bottom: 16px;
-        }}
+        }
         
         /* KPI Cards */
-        .kpi-card {{
+        .kpi-card {
           background: linear-gradient(135deg, var(--color-primary) 0%, #2a5f8f 100%);
           border-radius: 12px;
           padding: 24px;
           color: white;
           text-align: center;
           box-shadow: 0 6px 20px rgba(31, 119, 180, 0.3);
-        }}
+        }
+        
+        .kpi-row {
+          display: flex;
+          gap: 16px;
+          margin-bottom: 16px;
+        }
+        
+        .kpi-row > .kpi-card {
+          flex: 1 1 0;
+        }
         
-        .kpi-title {{
+        .kpi-title {
           font-size: 14px;
           opacity: 0.9;
           margin-bottom: 8px;
           font-weight: 500;
-        }}
+        }
         
-        .kpi-value {{
+        .kpi-value {
           font-size: 32px;
           font-weight: 700;
           margin: 8px 0;
-        }}
+        }
         
-        .kpi-delta {{
+        .kpi-delta {
           font-size: 12px;
           padding: 4px 8px;
           border-radius: 4px;
           display: inline-block;
           margin-top: 8px;
-        }}
+        }
         
-        .kpi-delta.up {{
+        .kpi-delta.up {
           background: rgba(44, 160, 124, 0.2);
           color: var(--color-teal);
-        }}
+        }
         
-        .kpi-delta.down {{
+        .kpi-delta.down {
           background: rgba(255, 127, 14, 0.2);
           color: var(--color-alert);
-        }}
+        }
         
         /* Alert Banner */
-        .alert-banner {{
+        .alert-banner {
           padding: 12px 16px;
           border-radius: 8px;
           margin-bottom: 16px;
           border-left: 4px solid;
-        }}
+        }
         
-        .alert-info {{
+        .alert-info {
           background: #e3f2fd;
           border-color: var(--color-primary);
           color: #1976d2;
-        }}
+        }
         
-        .alert-warning {{
+        .alert-warning {
           background: #fff3e0;
           border-color: var(--color-alert);
           color: #f57c00;
-        }}
+        }
         
-        .alert-success {{
+        .alert-success {
           background: #e8f5e9;
           border-color: var(--color-teal);
           color: #388e3c;
-        }}
+        }
         
         /* Empty State */
-        .empty-state {{
+        .empty-state {
           text-align: center;
           padding: 60px 20px;
           color: var(--text-light);
-        }}
+        }
         
-        .empty-state-icon {{
+        .empty-state-icon {
           font-size: 64px;
           margin-bottom: 16px;
-        }}
+        }
         
         /* Section Headers */
-        .section-header {{
+        .section-header {
           font-size: 24px;
           font-weight: 700;
           color: var(--text);
           margin: 24px 0 16px 0;
           padding-bottom: 8px;
           border-bottom: 2px solid var(--color-primary);
-        }}
+        }
         
         /* Loading Spinner */
-        .spinner-overlay {{
+        .spinner-overlay {
           display: flex;
           justify-content: center;
           align-items: center;
           min-height: 200px;
-        }}
+        }
         
         /* Focus states for accessibility */
         button:focus-visible,
         input:focus-visible,
-        select:focus-visible {{
+        select:focus-visible {
           outline: 2px solid var(--color-primary);
           outline-offset: 2px;
-        }}
+        }
         
         /* Code blocks */
-        code {{
+        code {
           font-family: 'Fira Mono', monospace;
           background: #f5f5f5;
           padding: 2px 6px;
           border-radius: 4px;
           font-size: 0.9em;
-        }}
+        }
         </style>
-        """
+        """))
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _theme_css(colors: Tuple[Tuple[str, str], ...]) -> str:
+    """Render the theme stylesheet once per palette.
+    
+    Args:
+        colors: Palette as sorted ``(name, hex)`` pairs (hashable cache key)
+        
+    Returns:
+        ``<style>`` block for ``st.markdown``
+    """
+    return _CSS_TEMPLATE.substitute({**AQUA_COLORS, **dict(colors)})
+
+
+@st.cache_resource(show_spinner=False)
+def _get_theme_manager(settings_mtime: Optional[float]) -> "ThemeManager":
+    """Share one ThemeManager per settings file version across reruns.
+    
+    Args:
+        settings_mtime: Modification time of the settings file, or None if
+            it is missing (only used as a cache key)
+        
+    Returns:
+        Shared ThemeManager
+    """
+    return ThemeManager()
+
+
+class ThemeManager:
+    """Manages theme injection and design system constants."""
+    
+    def __init__(self):
+        """Initialize theme manager with config."""
+        self.config = self._load_config()
+        self.colors = self.config.get("theme", {}).get("colors", AQUA_COLORS)
+    
+    def _load_config(self) -> Dict[str, Any]:
+        """Load settings from config file."""
+        try:
+            if SETTINGS_PATH.exists():
+                return _load_settings(str(SETTINGS_PATH), SETTINGS_PATH.stat().st_mtime)
+        except Exception:
+            pass
+        return {}
+    
+    def inject_theme(self) -> None:
+        """Inject CSS theme into Streamlit app."""
+        css = _theme_css(tuple(sorted(self.colors.items())))
         st.markdown(css, unsafe_allow_html=True)
     
     def get_color(self, name: str) -> str:
@@ -191,7 +267,8 @@ class ThemeManager:
 
 def inject_theme():
     """Convenience function to inject theme."""
-    manager = ThemeManager()
+    settings_mtime = SETTINGS_PATH.stat().st_mtime if SETTINGS_PATH.exists() else None
+    manager = _get_theme_manager(settings_mtime)
     manager.inject_theme()
     return manager
 
@@ -41,7 +41,8 @@ def main():
     
     # Step 3: Validate data
     print("\n[Step 3] Validating data quality...")
-    stats = ingestion.validate_data(df)
+    # Reuse the schema from step 2 for the duplicate-record key
+    stats = ingestion.validate_data(df, schema=schema)
     print(f"✓ Total rows: {stats['rows']}")
     print(f"✓ Missing data: {stats['missing_pct']:.1f}%")
     print(f"✓ Duplicates: {stats['duplicates']}")
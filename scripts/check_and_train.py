@@ -1,6 +1,8 @@
 """Check dependencies and run training if available."""
 
+import importlib.util
 import sys
+from importlib import metadata
 from pathlib import Path
 
 # Add project root to path
@@ -15,40 +17,25 @@ print("=" * 60)
 print("\n[1/3] Checking dependencies...")
 missing = []
 
-try:
-    import pandas as pd
-    print("[OK] Pandas:", pd.__version__)
-except ImportError:
-    print("[FAIL] Pandas NOT installed")
-    missing.append("pandas")
-
-try:
-    import numpy as np
-    print("[OK] NumPy:", np.__version__)
-except ImportError:
-    print("[FAIL] NumPy NOT installed")
-    missing.append("numpy")
-
-try:
-    import lightgbm
-    print("[OK] LightGBM: Available")
-except ImportError:
-    print("[WARN] LightGBM: NOT available (needs Python 3.11)")
-    missing.append("lightgbm")
-
-try:
-    import prophet
-    print("[OK] Prophet: Available")
-except ImportError:
-    print("[WARN] Prophet: NOT available (needs Python 3.11)")
-    missing.append("prophet")
+# Probe packages without importing them: LightGBM and Prophet load native
+# libraries at import time, and nothing below needs them until training
+for dist, label in [("pandas", "Pandas"), ("numpy", "NumPy")]:
+    try:
+        print(f"[OK] {label}:", metadata.version(dist))
+    except metadata.PackageNotFoundError:
+        print(f"[FAIL] {label} NOT installed")
+        missing.append(dist)
 
-try:
-    from sklearn.ensemble import RandomForestRegressor
-    print("[OK] scikit-learn: Available")
-except ImportError:
-    print("[WARN] scikit-learn: NOT available (needs Python 3.11)")
-    missing.append("scikit-learn")
+for module, label, dist in [
+    ("lightgbm", "LightGBM", "lightgbm"),
+    ("prophet", "Prophet", "prophet"),
+    ("sklearn", "scikit-learn", "scikit-learn"),
+]:
+    if importlib.util.find_spec(module) is not None:
+        print(f"[OK] {label}: Available")
+    else:
+        print(f"[WARN] {label}: NOT available (needs Python 3.11)")
+        missing.append(dist)
 
 # Check data
 print("\n[2/3] Checking sample data...")
@@ -5,12 +5,63 @@ import numpy as np
 from pathlib import Path
 from datetime import datetime, timedelta
 
+# Optional import: PyArrow writes Parquet; CSV is the fallback
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# UCI Water Treatment-style columns and their uniform (low, high) ranges
+UCI_RANGES = {
+    'Q_E': (500, 2000),  # Input flow
+    'ZN_E': (0, 5),  # Zinc
+    'PH_E': (6.5, 8.5),  # pH
+    'DBO_E': (10, 50),  # BOD
+    'DQO_E': (50, 200),  # COD
+    'SS_E': (20, 100),  # Suspended solids
+    'SED_E': (5, 30),  # Sediment
+    'COND_E': (500, 2000),  # Conductivity
+    'PH_P': (6.8, 8.0),  # pH Primary
+    'DBO_P': (5, 30),  # BOD Primary
+    'SS_P': (10, 60),  # SS Primary
+}
+
+
+def _save_dataset(df: pd.DataFrame, output_path: str, fmt: str = "csv") -> Path:
+    """Write a generated dataset as CSV or Parquet.
+    
+    Args:
+        df: Dataset to write
+        output_path: Output file path (the suffix is replaced for Parquet)
+        fmt: "csv" or "parquet"; Parquet falls back to CSV without PyArrow
+        
+    Returns:
+        Path actually written
+        
+    Raises:
+        ValueError: If fmt is not supported
+    """
+    if fmt not in ("csv", "parquet"):
+        raise ValueError(f"Unsupported output format: {fmt}")
+    
+    output_path_obj = Path(output_path)
+    output_path_obj.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "parquet" and PYARROW_AVAILABLE:
+        # Columnar buffers are written in bulk (no per-cell text formatting)
+        output_path_obj = output_path_obj.with_suffix(".parquet")
+        df.to_parquet(output_path_obj, engine="pyarrow", compression="snappy", index=False)
+    else:
+        df.to_csv(output_path_obj, index=False)
+    return output_path_obj
+
 
 def generate_wwtp_sample(
     n_sites: int = 3,
     n_days: int = 365,
     start_date: str = "2019-01-01",
     output_path: str = "app/data/raw/wwtp_sample.csv",
+    fmt: str = "csv",
 ) -> pd.DataFrame:
     """Generate synthetic WWTP dataset similar to Kaggle Melbourne dataset.
     
@@ -19,86 +70,91 @@ def generate_wwtp_sample(
         n_days: Number of days of data
         start_date: Start date string
         output_path: Output file path
+        fmt: Output format, "csv" or "parquet"
         
     Returns:
         Generated DataFrame
     """
-    dates = pd.date_range(start=start_date, periods=n_days, freq='D')
+    # Daily dates as native datetime64 (start plus whole-day offsets)
+    start = pd.Timestamp(start_date).to_datetime64().astype('datetime64[ns]')
+    dates = start + np.arange(n_days).astype('timedelta64[D]')
     sites = [f"WWTP_{i+1:02d}" for i in range(n_sites)]
+    n = n_sites * n_days
+    
+    rng = np.random.default_rng(42)
+    
+    # One row per (site, day), site-major; per-site values are repeated
+    site_ids = np.repeat(sites, n_days)
+    dates_arr = np.tile(dates, n_sites)
+    
+    # Base levels for each site
+    base_bod = np.repeat(rng.uniform(5, 15, size=n_sites), n_days)
+    base_cod = np.repeat(rng.uniform(20, 40, size=n_sites), n_days)
+    base_tss = np.repeat(rng.uniform(10, 25, size=n_sites), n_days)
+    
+    # Seasonal patterns
+    day_of_year = np.tile(np.arange(n_days) % 365, n_sites)
+    seasonal = np.sin(2 * np.pi * day_of_year / 365) * 3
+    
+    # Random noise
+    noise_bod = rng.normal(0, 1, size=n)
+    noise_cod = rng.normal(0, 2, size=n)
+    noise_tss = rng.normal(0, 1.5, size=n)
+    
+    # Influent values (higher)
+    influent_bod = base_bod * 4 + seasonal + noise_bod * 2
+    influent_cod = base_cod * 4 + seasonal * 1.5 + noise_cod * 3
+    influent_tss = base_tss * 3 + seasonal + noise_tss * 2
+    
+    # Effluent values (treated, lower)
+    treatment_efficiency = rng.uniform(0.85, 0.95, size=n)
+    effluent_bod = np.maximum(0, influent_bod * (1 - treatment_efficiency))
+    effluent_cod = np.maximum(0, influent_cod * (1 - treatment_efficiency * 0.9))
+    effluent_tss = np.maximum(0, influent_tss * (1 - treatment_efficiency * 0.85))
+    
+    # Nutrients
+    nh4 = rng.uniform(0.5, 3.0, size=n) + seasonal * 0.3
+    no3 = rng.uniform(2.0, 8.0, size=n) + seasonal * 0.5
+    po4 = rng.uniform(0.3, 2.0, size=n) + seasonal * 0.2
+    
+    # Operational parameters
+    flow = rng.uniform(1000, 5000, size=n)  # m3/day
+    temperature = 15 + seasonal * 5 + rng.normal(0, 2, size=n)
+    aeration = rng.uniform(50, 200, size=n)  # kWh
+    energy_kwh = flow * 0.5 + aeration + rng.normal(0, 100, size=n)
+    
+    measurements = {
+        'influent_bod': influent_bod,
+        'influent_cod': influent_cod,
+        'influent_tss': influent_tss,
+        'effluent_bod': effluent_bod,
+        'effluent_cod': effluent_cod,
+        'effluent_tss': effluent_tss,
+        'nh4': nh4,
+        'no3': no3,
+        'po4': po4,
+        'flow_m3d': flow,
+        'temperature_c': temperature,
+        'aeration_kwh': aeration,
+        'energy_kwh': energy_kwh,
+    }
     
-    np.random.seed(42)
-    data = []
+    # Round each column in place to 2 decimals (no rounded copy of the frame)
+    for values in measurements.values():
+        np.round(values, 2, out=values)
     
-    for site in sites:
-        # Base levels for each site
-        base_bod = np.random.uniform(5, 15)
-        base_cod = np.random.uniform(20, 40)
-        base_tss = np.random.uniform(10, 25)
-        
-        # Seasonal patterns
-        day_of_year = np.arange(n_days) % 365
-        
-        for i, date in enumerate(dates):
-            # Seasonal variation
-            seasonal = np.sin(2 * np.pi * day_of_year[i] / 365) * 3
-            
-            # Random noise
-            noise_bod = np.random.normal(0, 1)
-            noise_cod = np.random.normal(0, 2)
-            noise_tss = np.random.normal(0, 1.5)
-            
-            # Influent values (higher)
-            influent_bod = base_bod * 4 + seasonal + noise_bod * 2
-            influent_cod = base_cod * 4 + seasonal * 1.5 + noise_cod * 3
-            influent_tss = base_tss * 3 + seasonal + noise_tss * 2
-            
-            # Effluent values (treated, lower)
-            treatment_efficiency = np.random.uniform(0.85, 0.95)
-            effluent_bod = max(0, influent_bod * (1 - treatment_efficiency))
-            effluent_cod = max(0, influent_cod * (1 - treatment_efficiency * 0.9))
-            effluent_tss = max(0, influent_tss * (1 - treatment_efficiency * 0.85))
-            
-            # Nutrients
-            nh4 = np.random.uniform(0.5, 3.0) + seasonal * 0.3
-            no3 = np.random.uniform(2.0, 8.0) + seasonal * 0.5
-            po4 = np.random.uniform(0.3, 2.0) + seasonal * 0.2
-            
-            # Operational parameters
-            flow = np.random.uniform(1000, 5000)  # m3/day
-            temperature = 15 + seasonal * 5 + np.random.normal(0, 2)
-            aeration = np.random.uniform(50, 200)  # kWh
-            energy_kwh = flow * 0.5 + aeration + np.random.normal(0, 100)
-            
-            data.append({
-                'date': date,
-                'site_id': site,
-                'influent_bod': round(influent_bod, 2),
-                'influent_cod': round(influent_cod, 2),
-                'influent_tss': round(influent_tss, 2),
-                'effluent_bod': round(effluent_bod, 2),
-                'effluent_cod': round(effluent_cod, 2),
-                'effluent_tss': round(effluent_tss, 2),
-                'nh4': round(nh4, 2),
-                'no3': round(no3, 2),
-                'po4': round(po4, 2),
-                'flow_m3d': round(flow, 2),
-                'temperature_c': round(temperature, 2),
-                'aeration_kwh': round(aeration, 2),
-                'energy_kwh': round(energy_kwh, 2),
-            })
-    
-    df = pd.DataFrame(data)
-    
-    # Add some missing values (5%)
-    missing_indices = np.random.choice(len(df), size=int(len(df) * 0.05), replace=False)
-    for col in ['effluent_bod', 'effluent_cod', 'effluent_tss']:
-        missing_col = np.random.choice(missing_indices, size=len(missing_indices)//3, replace=False)
-        df.loc[missing_col, col] = np.nan
+    # Add some missing values (5%): one shuffle, split into a disjoint
+    # third per effluent column
+    perm = rng.permutation(n)
+    chunk = int(n * 0.05) // 3
+    for i, col in enumerate(['effluent_bod', 'effluent_cod', 'effluent_tss']):
+        measurements[col][perm[i * chunk:(i + 1) * chunk]] = np.nan
+    
+    # copy=False keeps each column array as its own block (no consolidation copy)
+    df = pd.DataFrame({'date': dates_arr, 'site_id': site_ids, **measurements}, copy=False)
     
     # Save to file
-    output_path_obj = Path(output_path)
-    output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_path, index=False)
+    output_path = _save_dataset(df, output_path, fmt)
     
     print(f"[OK] Generated dataset: {len(df)} rows, {len(df.columns)} columns")
     print(f"Saved to: {output_path}")
@@ -109,38 +165,27 @@ def generate_wwtp_sample(
 def generate_uci_sample(
     output_path: str = "app/data/raw/uci_sample.csv",
     n_records: int = 500,
+    fmt: str = "csv",
 ) -> pd.DataFrame:
     """Generate synthetic dataset similar to UCI Water Treatment.
     
     Args:
         output_path: Output file path
         n_records: Number of records
+        fmt: Output format, "csv" or "parquet"
         
     Returns:
         Generated DataFrame
     """
-    np.random.seed(42)
-    
-    data = {
-        'Q_E': np.random.uniform(500, 2000, n_records),  # Input flow
-        'ZN_E': np.random.uniform(0, 5, n_records),  # Zinc
-        'PH_E': np.random.uniform(6.5, 8.5, n_records),  # pH
-        'DBO_E': np.random.uniform(10, 50, n_records),  # BOD
-        'DQO_E': np.random.uniform(50, 200, n_records),  # COD
-        'SS_E': np.random.uniform(20, 100, n_records),  # Suspended solids
-        'SED_E': np.random.uniform(5, 30, n_records),  # Sediment
-        'COND_E': np.random.uniform(500, 2000, n_records),  # Conductivity
-        'PH_P': np.random.uniform(6.8, 8.0, n_records),  # pH Primary
-        'DBO_P': np.random.uniform(5, 30, n_records),  # BOD Primary
-        'SS_P': np.random.uniform(10, 60, n_records),  # SS Primary
-    }
+    rng = np.random.default_rng(42)
     
-    df = pd.DataFrame(data)
+    # One draw for every column: per-column bounds broadcast across rows
+    lows, highs = np.array(list(UCI_RANGES.values())).T
+    values = rng.uniform(lows, highs, size=(n_records, len(UCI_RANGES)))
+    df = pd.DataFrame(values, columns=list(UCI_RANGES))
     
     # Save to file
-    output_path_obj = Path(output_path)
-    output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_path, index=False)
+    output_path = _save_dataset(df, output_path, fmt)
     
     print(f"[OK] Generated UCI-style dataset: {len(df)} rows, {len(df.columns)} columns")
     print(f"Saved to: {output_path}")
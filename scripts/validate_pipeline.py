@@ -38,7 +38,7 @@ try:
     
     # Validate data
     print("\n[Step 3] Data quality validation...")
-    stats = ingestion.validate_data(df)
+    stats = ingestion.validate_data(df, schema=schema)
     print(f"[OK] Total rows: {stats['rows']:,}")
     print(f"[OK] Missing data: {stats['missing_pct']:.1f}%")
     print(f"[OK] Duplicates: {stats['duplicates']}")
@@ -54,7 +54,7 @@ try:
         factory = FeatureFactory(max_lags=3)
         try:
             feature_set = factory.build(
-                df.head(200),  # Use subset for speed
+                df.iloc[:200],  # Use subset for speed (a slice; build does not mutate it)
                 target_col=target,
                 date_col=schema['date_column'],
                 site_col=schema['site_column'],
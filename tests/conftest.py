@@ -2,10 +2,14 @@
 
 import sys
 from pathlib import Path
+import pytest
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 
-
+@pytest.fixture(scope="session")
+def reports_cache_dir(tmp_path_factory):
+    """Content-addressed report cache shared by the whole test session."""
+    return tmp_path_factory.mktemp("reports_cache")
@@ -10,16 +10,17 @@ from app.ai.pipeline.validation import ValidationSuite
 from app.ai.pipeline.serving import ServingLayer
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_df():
-    """Create sample DataFrame for testing."""
+    """Create sample DataFrame for testing (shared; tests must not modify it)."""
     dates = pd.date_range('2020-01-01', periods=100, freq='D')
+    noise = np.random.default_rng(0).standard_normal((3, 100))
     return pd.DataFrame({
         'date': dates,
         'site_id': ['WWTP_01'] * 100,
-        'target': np.random.randn(100).cumsum() + 50,
-        'feature1': np.random.randn(100),
-        'feature2': np.random.randn(100),
+        'target': noise[0].cumsum() + 50,
+        'feature1': noise[1],
+        'feature2': noise[2],
     })
 
 
@@ -38,6 +39,33 @@ def test_ingestion_load_csv(tmp_path):
     assert 'b' in loaded_df.columns
 
 
+def test_ingestion_load_feather(tmp_path):
+    """Test Feather loading."""
+    test_file = tmp_path / "test.feather"
+    df = pd.DataFrame({'a': [1, 2, 3], 'b': [4.0, 5.0, 6.0]})
+    df.to_feather(test_file)
+    
+    engine = DataIngestionEngine()
+    loaded_df = engine.load_from_path(str(test_file))
+    
+    pd.testing.assert_frame_equal(loaded_df, df)
+    assert len(engine.load_from_path(str(test_file), nrows=2)) == 2
+
+
+def test_ingestion_load_from_buffer():
+    """Test loading an in-memory CSV upload."""
+    import io
+    
+    buffer = io.BytesIO(pd.DataFrame({'a': [1, 2, 3], 'b': [4, 5, 6]}).to_csv(index=False).encode())
+    
+    engine = DataIngestionEngine()
+    loaded_df = engine.load_from_buffer(buffer, 'CSV')
+    
+    assert loaded_df.shape == (3, 2)
+    with pytest.raises(ValueError):
+        engine.load_from_buffer(buffer, '.txt')
+
+
 def test_ingestion_detect_schema(sample_df):
     """Test schema detection."""
     engine = DataIngestionEngine()
@@ -75,6 +103,92 @@ def test_feature_factory_build(sample_df):
     assert len(feature_set.train_y) > 0
 
 
+def test_feature_factory_lgb_hint(sample_df):
+    """Test LightGBM feature hint keeps NaN and encodes strings as categoricals."""
+    df = sample_df.assign(shift=['day', 'night'] * 50)
+    factory = FeatureFactory(max_lags=3)
+    feature_set = factory.build(
+        df,
+        target_col='target',
+        date_col='date',
+        site_col='site_id',
+        model_hint='lgb',
+    )
+    
+    assert feature_set.train_X['target_lag_1'].isnull().any()
+    assert isinstance(feature_set.train_X['shift'].dtype, pd.CategoricalDtype)
+    
+    dense = FeatureFactory.densify(feature_set.train_X)
+    assert not dense.isnull().any().any()
+    assert pd.api.types.is_integer_dtype(dense['shift'])
+
+
+def test_feature_factory_lags_stay_within_site():
+    """Test lags never reach across into another site's rows."""
+    dates = pd.date_range('2020-01-01', periods=30, freq='D')
+    df = pd.DataFrame({
+        'date': np.tile(dates, 2),
+        'site_id': np.repeat(['WWTP_01', 'WWTP_02'], 30),
+        'target': np.r_[np.arange(30.0), np.arange(30.0) + 100],
+    }).sample(frac=1, random_state=0)
+    factory = FeatureFactory(max_lags=3)
+    feature_set = factory.build(
+        df,
+        target_col='target',
+        date_col='date',
+        site_col='site_id',
+        model_hint='lgb',
+    )
+    
+    X = pd.concat([feature_set.train_X, feature_set.val_X, feature_set.test_X])
+    y = pd.concat([feature_set.train_y, feature_set.val_y, feature_set.test_y])
+    frame = X.assign(target=y, site_id=df.loc[X.index, 'site_id'], date=df.loc[X.index, 'date'])
+    for _, site in frame.sort_values('date').groupby('site_id'):
+        for k in range(1, 4):
+            assert site[f'target_lag_{k}'].iloc[:k].isnull().all()
+            assert site[f'target_lag_{k}'].iloc[k:].notnull().all()
+        np.testing.assert_array_equal(
+            site['target_lag_1'].iloc[1:].to_numpy(),
+            site['target'].iloc[:-1].to_numpy(),
+        )
+
+
+def test_feature_factory_single_site(sample_df):
+    """Test single-site fast path builds lags in date order."""
+    df = sample_df.drop(columns=['site_id']).iloc[::-1]
+    factory = FeatureFactory(max_lags=3)
+    feature_set = factory.build(df, target_col='target', date_col='date')
+    
+    train = sample_df.loc[feature_set.train_X.index]
+    assert (train['date'].diff().dropna() > pd.Timedelta(0)).all()
+    assert np.allclose(
+        feature_set.train_X['target_lag_1'].iloc[1:],
+        feature_set.train_y.iloc[:-1],
+    )
+
+
+@pytest.mark.parametrize('window', [1, 3, 30])
+def test_group_rolling_kernel_matches_pandas(window):
+    """Test the rolling kernel against grouped pandas rolling (min_periods=1)."""
+    from app.ai.pipeline._kernels import group_rolling_mean_std
+    
+    # Three contiguous sites of different lengths (one shorter than the window)
+    sizes = [40, 7, 25]
+    y = np.random.default_rng(1).standard_normal(sum(sizes)) * 10 + 50
+    group_ids = np.repeat(np.arange(len(sizes), dtype=np.int32), sizes)
+    out_mean = np.empty_like(y)
+    out_std = np.empty_like(y)
+    group_rolling_mean_std(y, group_ids, window, out_mean, out_std)
+    
+    expected = (
+        pd.Series(y).groupby(group_ids, sort=False)
+        .rolling(window, min_periods=1).agg(['mean', 'std'])
+    )
+    np.testing.assert_allclose(out_mean, expected['mean'].to_numpy(), rtol=1e-9, atol=1e-9)
+    np.testing.assert_array_equal(np.isnan(out_std), expected['std'].isna().to_numpy())
+    np.testing.assert_allclose(out_std, expected['std'].to_numpy(), rtol=1e-7, atol=1e-7, equal_nan=True)
+
+
 def test_validation_validate_model_inputs(sample_df):
     """Test model input validation."""
     validator = ValidationSuite()
@@ -85,15 +199,18 @@ def test_validation_validate_model_inputs(sample_df):
     assert result['valid'] is True
 
 
+class DummyModel:
+    """Picklable stand-in model (a class local to a test cannot be pickled)."""
+    
+    def predict(self, X):
+        return np.array([1, 2, 3])
+
+
 def test_serving_save_load_model(tmp_path):
     """Test model save and load."""
     serving = ServingLayer(registry_path=str(tmp_path))
     
     # Create dummy model
-    class DummyModel:
-        def predict(self, X):
-            return np.array([1, 2, 3])
-    
     model = DummyModel()
     path = serving.save_model(model, "test_model")
     
@@ -7,14 +7,13 @@ from pathlib import Path
 from app.ui.export.manager import ExportManager
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_report_data():
-    """Create sample data for reports."""
-    return pd.DataFrame({
-        'metric1': np.random.randn(50),
-        'metric2': np.random.randn(50),
-        'metric3': np.random.randn(50),
-    })
+    """Create sample data for reports (shared; tests must not modify it)."""
+    return pd.DataFrame(
+        np.random.default_rng(0).standard_normal((50, 3)),
+        columns=['metric1', 'metric2', 'metric3'],
+    )
 
 
 def test_pdf_generation(tmp_path, sample_report_data):
@@ -82,4 +81,48 @@ def test_pptx_generation(tmp_path, sample_report_data):
     assert report_path.endswith('.pptx')
 
 
+def test_generate_all(tmp_path, sample_report_data):
+    """Test concurrent multi-format report generation."""
+    exporter = ExportManager(output_dir=str(tmp_path))
+    
+    metadata = {
+        'title': 'Test Report',
+        'subtitle': 'Test Subtitle',
+        'author': 'Test Author',
+        'date': '2024-01-01',
+        'sections': ['KPIs'],
+        'include_charts': False,
+        'include_raw_data': False,
+    }
+    
+    report_paths = exporter.generate_all(sample_report_data, metadata)
+    
+    assert list(report_paths) == ['pdf', 'pptx', 'html']
+    for fmt, report_path in report_paths.items():
+        assert Path(report_path).exists()
+        assert report_path.endswith(f'.{fmt}')
+    
+    # All formats share one timestamp suffix
+    assert len({Path(p).stem for p in report_paths.values()}) == 1
 
+
+def test_report_cache_reuses_rendering(tmp_path, sample_report_data, reports_cache_dir):
+    """Test identical reports are copied from the cache instead of re-rendered."""
+    exporter = ExportManager(output_dir=str(tmp_path), cache_dir=str(reports_cache_dir))
+    
+    metadata = {
+        'title': 'Test Report',
+        'subtitle': 'Test Subtitle',
+        'author': 'Test Author',
+        'date': '2024-01-01',
+        'sections': ['KPIs'],
+        'include_charts': False,
+        'include_raw_data': False,
+    }
+    
+    first = exporter.generate_pdf_report(sample_report_data, metadata, timestamp='first')
+    second = exporter.generate_pdf_report(sample_report_data, metadata, timestamp='second')
+    
+    assert first != second
+    assert Path(first).read_bytes() == Path(second).read_bytes()
+    assert len(list(reports_cache_dir.glob('*.pdf'))) == 1
@@ -42,6 +42,62 @@ def test_state_manager_dataset():
     
     assert retrieved is not None
     assert len(retrieved) == 3
+    # Stored by reference: no copy or conversion on get
+    assert retrieved is df
 
 
+def test_state_manager_numeric_cols():
+    """Test numeric column cache is reset by set_dataset."""
+    import pandas as pd
+    
+    StateManager.init_session_state()
+    StateManager.set_dataset(pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']}))
+    assert StateManager.get_numeric_cols() == ['a']
+    
+    StateManager.set_dataset(pd.DataFrame({'c': [1.0, 2.0], 'd': [3, 4]}))
+    assert StateManager.get_numeric_cols() == ['c', 'd']
+    
+    stats = StateManager.get_column_stats()
+    assert stats['c'] == {'min': 1.0, 'max': 2.0, 'mean': 1.5}
+    assert stats['d']['mean'] == 3.5
+
+
+def test_state_manager_model_paths(tmp_path):
+    """Test models stored by registry path are loaded on access."""
+    from app.ai.pipeline.serving import ServingLayer
+    
+    serving = ServingLayer(registry_path=str(tmp_path))
+    path = serving.save_model({'coef': [1.0, 2.0]}, "test_model")
+    
+    StateManager.init_session_state()
+    StateManager.set_model("saved", {'coef': [1.0, 2.0]}, path=path)
+    StateManager.set_model("in_memory", {'coef': [3.0]})
+    
+    assert StateManager.has_models()
+    assert StateManager.get_model("saved") == {'coef': [1.0, 2.0]}
+    assert StateManager.get_all_models() == {
+        'in_memory': {'coef': [3.0]},
+        'saved': {'coef': [1.0, 2.0]},
+    }
+
 
+def test_dashboard_kpis_skip_text_code_columns():
+    """Test text '*_code' and 'last_update' columns never feed the KPI cards."""
+    import pandas as pd
+    from app.ui.pages.dashboard import _dashboard_kpis
+    
+    df = pd.DataFrame({
+        'last_update': ['yes', 'no', 'yes'],
+        'date': pd.date_range('2024-01-01', periods=3, freq='D'),
+        'plant_code': ['P1', 'P2', 'P3'],
+        'bod': [1.0, 2.0, 3.0],
+    })
+    StateManager.init_session_state()
+    StateManager.set_dataset(df)
+    
+    kpis = _dashboard_kpis(StateManager.get_dataset_key(), df, StateManager.get_schema()['date_column'])
+    
+    assert kpis['bod'] == 3.0
+    assert kpis['cod'] is None
+    assert kpis['date_col'] == 'date'
+    assert kpis['date_range_days'] == 2